@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from .models import OrderRollup
+
+
+@admin.register(OrderRollup)
+class OrderRollupAdmin(admin.ModelAdmin):
+    list_display = ("establishment", "date", "hour", "beverage", "status", "count")
+    list_filter = ("status", "date")
+    raw_id_fields = ("establishment", "beverage")
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from apps.analytics.rollups import rebuild_order_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recounts the order rollups from the orders table, for orders placed "
+        "before analytics was deployed or after the rollups drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--establishment",
+            type=int,
+            action="append",
+            dest="establishments",
+            help="Only rebuild this establishment, can be repeated.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rollup rows inserted per statement.",
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_order_rollups(
+            establishment_ids=options["establishments"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} order rollups"))
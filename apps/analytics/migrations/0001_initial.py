@@ -0,0 +1,69 @@
+# Generated by Django 4.2 on 2026-10-18 18:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("beverage", "0011_alter_beverage_price"),
+        ("partner", "0011_happyhourschedule"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrderRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("hour", models.PositiveSmallIntegerField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("in_preparation", "In Preparation"),
+                            ("completed", "Completed"),
+                            ("cancelled", "Cancelled"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "beverage",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="order_rollups",
+                        to="beverage.beverage",
+                    ),
+                ),
+                (
+                    "establishment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="order_rollups",
+                        to="partner.establishment",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="orderrollup",
+            constraint=models.UniqueConstraint(
+                fields=("establishment", "date", "hour", "beverage", "status"),
+                name="order_rollup_bucket_unique",
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import models
+
+from apps.beverage.models import Beverage
+from apps.order.models import Order
+from apps.partner.models import Establishment
+
+
+class OrderRollup(models.Model):
+    """
+    Number of orders of an establishment per local day, hour, beverage and
+    status. Kept up to date as orders are placed and change status, so
+    dashboards read a bounded number of rows whatever the order history size.
+    """
+
+    establishment = models.ForeignKey(
+        Establishment, on_delete=models.CASCADE, related_name="order_rollups"
+    )
+    beverage = models.ForeignKey(
+        Beverage, on_delete=models.CASCADE, related_name="order_rollups"
+    )
+    date = models.DateField()
+    hour = models.PositiveSmallIntegerField()
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["establishment", "date", "hour", "beverage", "status"],
+                name="order_rollup_bucket_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.establishment_id} {self.date} {self.hour}h {self.status}: {self.count}"
@@ -0,0 +1,54 @@
+import datetime
+
+from django.db.models import Sum
+
+from apps.order.models import Order
+from .models import OrderRollup
+
+
+def order_dashboard(establishment_id, date_from, date_to, top=5):
+    """
+    Order statistics of an establishment between two local dates, inclusive,
+    read from the rollups with one query per section
+    """
+    rollups = OrderRollup.objects.filter(
+        establishment_id=establishment_id, date__range=(date_from, date_to)
+    ).order_by()
+
+    by_status = dict(rollups.values_list("status").annotate(orders=Sum("count")))
+    by_hour = dict(rollups.values_list("hour").annotate(orders=Sum("count")))
+    by_date = dict(rollups.values_list("date").annotate(orders=Sum("count")))
+    top_beverages = (
+        rollups.values("beverage_id", "beverage__name")
+        .annotate(orders=Sum("count"))
+        .order_by("-orders", "beverage_id")[:top]
+    )
+
+    # orders still pending or in preparation are not finished yet
+    completed = by_status.get("completed", 0)
+    finished = completed + by_status.get("cancelled", 0)
+    days = (date_to - date_from).days + 1
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "total_orders": sum(by_status.values()),
+        "orders_by_status": {
+            status: by_status.get(status, 0) for status, _ in Order.STATUS_CHOICES
+        },
+        "completion_rate": round(completed / finished, 4) if finished else None,
+        "orders_by_hour": [
+            {"hour": hour, "orders": by_hour.get(hour, 0)} for hour in range(24)
+        ],
+        "orders_by_day": [
+            {"date": date, "orders": by_date.get(date, 0)}
+            for date in (date_from + datetime.timedelta(days=n) for n in range(days))
+        ],
+        "top_beverages": [
+            {
+                "id": row["beverage_id"],
+                "name": row["beverage__name"],
+                "orders": row["orders"],
+            }
+            for row in top_beverages
+        ],
+    }
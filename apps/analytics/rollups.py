@@ -0,0 +1,99 @@
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import ExtractHour, TruncDate
+from django.utils import timezone
+
+from apps.order.models import Order
+from .models import OrderRollup
+
+
+def rollup_bucket(establishment_id, beverage_id, order_date, status):
+    """
+    Rollup row an order is counted in, days and hours are local time
+    """
+    local = timezone.localtime(order_date)
+    return establishment_id, beverage_id, local.date(), local.hour, status
+
+
+def apply_rollup_deltas(deltas):
+    """
+    Add count changes to their rollup rows with `count = count + delta`,
+    creating rows seen for the first time
+    :param deltas: mapping of `rollup_bucket` -> count change
+    """
+    # a fixed order, concurrent transactions lock the rows in the same order
+    for bucket, delta in sorted(deltas.items()):
+        if not delta:
+            continue
+        establishment_id, beverage_id, date, hour, status = bucket
+        lookup = {
+            "establishment_id": establishment_id,
+            "beverage_id": beverage_id,
+            "date": date,
+            "hour": hour,
+            "status": status,
+        }
+        rollups = OrderRollup.objects.filter(**lookup)
+        if rollups.update(count=F("count") + delta) or delta < 0:
+            continue
+        try:
+            with transaction.atomic():
+                OrderRollup.objects.create(count=delta, **lookup)
+        except IntegrityError:
+            # created by a concurrent transaction in the meantime
+            rollups.update(count=F("count") + delta)
+
+
+def record_status_changes(changes):
+    """
+    Move orders between rollup buckets
+    :param changes: iterable of (establishment_id, beverage_id, order_date,
+    old_status, new_status), old_status is None for new orders
+    """
+    deltas = Counter()
+    for establishment_id, beverage_id, order_date, old_status, new_status in changes:
+        if old_status == new_status:
+            continue
+        if old_status is not None:
+            deltas[
+                rollup_bucket(establishment_id, beverage_id, order_date, old_status)
+            ] -= 1
+        deltas[rollup_bucket(establishment_id, beverage_id, order_date, new_status)] += 1
+    apply_rollup_deltas(deltas)
+
+
+def rebuild_order_rollups(establishment_ids=None, batch_size=1000):
+    """
+    Recount the rollups from the orders table
+    :param establishment_ids: only rebuild these establishments
+    :param batch_size: rows inserted per statement
+    :return: number of rollup rows written
+    """
+    orders = Order.objects.all()
+    rollups = OrderRollup.objects.all()
+    if establishment_ids is not None:
+        orders = orders.filter(establishment_id__in=establishment_ids)
+        rollups = rollups.filter(establishment_id__in=establishment_ids)
+    rows = (
+        orders.annotate(date=TruncDate("order_date"), hour=ExtractHour("order_date"))
+        .values("establishment_id", "beverage_id", "date", "hour", "status")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+
+    written = 0
+    with transaction.atomic():
+        rollups.delete()
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(OrderRollup(**row))
+            if len(batch) >= batch_size:
+                OrderRollup.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            OrderRollup.objects.bulk_create(batch)
+            written += len(batch)
+    return written
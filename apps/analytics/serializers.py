@@ -0,0 +1,55 @@
+import datetime
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import serializers
+
+
+class DashboardPeriodSerializer(serializers.Serializer):
+    """
+    Query params of the dashboard, the last 7 days by default
+    """
+
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        date_to = attrs.get("date_to") or timezone.localdate()
+        date_from = attrs.get("date_from") or date_to - datetime.timedelta(days=6)
+        if date_from > date_to:
+            raise serializers.ValidationError("date_from is after date_to")
+        if (date_to - date_from).days >= settings.ANALYTICS_MAX_DAYS:
+            raise serializers.ValidationError(
+                f"Period is longer than {settings.ANALYTICS_MAX_DAYS} days"
+            )
+        return {"date_from": date_from, "date_to": date_to}
+
+
+class HourOrdersSerializer(serializers.Serializer):
+    hour = serializers.IntegerField()
+    orders = serializers.IntegerField()
+
+
+class DayOrdersSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    orders = serializers.IntegerField()
+
+
+class BeverageOrdersSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    orders = serializers.IntegerField()
+
+
+class OrderDashboardSerializer(serializers.Serializer):
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+    total_orders = serializers.IntegerField()
+    orders_by_status = serializers.DictField(child=serializers.IntegerField())
+    completion_rate = serializers.FloatField(
+        allow_null=True,
+        help_text="Completed share of the completed and cancelled orders",
+    )
+    orders_by_hour = HourOrdersSerializer(many=True)
+    orders_by_day = DayOrdersSerializer(many=True)
+    top_beverages = BeverageOrdersSerializer(many=True)
@@ -0,0 +1,35 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.order.models import Order
+from apps.order.signals import orders_status_changed
+from .rollups import record_status_changes
+
+
+@receiver(post_save, sender=Order)
+def count_saved_order(sender, instance, created=False, raw=False, **kwargs):
+    """
+    Count new orders and move saved ones whose status changed. Deleted orders
+    are not subtracted, `backfill_order_rollups` recounts an establishment
+    """
+    if raw:
+        return
+    old_status = None if created else instance.loaded_status
+    if created or old_status is not None:
+        record_status_changes(
+            [
+                (
+                    instance.establishment_id,
+                    instance.beverage_id,
+                    instance.order_date,
+                    old_status,
+                    instance.status,
+                )
+            ]
+        )
+    instance.loaded_status = instance.status
+
+
+@receiver(orders_status_changed, sender=Order)
+def count_status_changes(sender, changes, **kwargs):
+    record_status_changes(changes)
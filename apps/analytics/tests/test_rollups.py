@@ -0,0 +1,55 @@
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.order.utils import update_orders_status
+from happyhours.factories import OrderFactory
+from ..models import OrderRollup
+
+
+def counts(establishment):
+    return dict(
+        OrderRollup.objects.filter(establishment=establishment, count__gt=0)
+        .values_list("status", "count")
+    )
+
+
+@pytest.mark.django_db
+class TestOrderRollups:
+    def test_new_order_is_counted(self):
+        order = OrderFactory()
+
+        rollup = OrderRollup.objects.get(establishment=order.establishment)
+        local = timezone.localtime(order.order_date)
+        assert (rollup.beverage_id, rollup.date, rollup.hour) == (
+            order.beverage_id,
+            local.date(),
+            local.hour,
+        )
+        assert (rollup.status, rollup.count) == ("pending", 1)
+
+    def test_status_change_on_save(self):
+        order = OrderFactory()
+        OrderFactory(establishment=order.establishment, beverage=order.beverage)
+
+        order.status = "completed"
+        order.save()
+
+        assert counts(order.establishment) == {"pending": 1, "completed": 1}
+
+    def test_bulk_status_change(self):
+        order = OrderFactory()
+        other = OrderFactory(establishment=order.establishment, beverage=order.beverage)
+
+        update_orders_status(order.establishment_id, [order.id, other.id], "cancelled")
+
+        assert counts(order.establishment) == {"cancelled": 2}
+
+    def test_backfill(self):
+        order = OrderFactory(status="completed")
+        OrderFactory(establishment=order.establishment, beverage=order.beverage)
+        OrderRollup.objects.all().delete()
+
+        call_command("backfill_order_rollups", establishment=[order.establishment_id])
+
+        assert counts(order.establishment) == {"pending": 1, "completed": 1}
@@ -0,0 +1,87 @@
+import datetime
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.order.utils import update_orders_status
+from happyhours.factories import (
+    BeverageFactory,
+    EstablishmentFactory,
+    OrderFactory,
+    UserFactory,
+)
+
+
+@pytest.mark.django_db
+class TestOrderDashboardView:
+    def setup_method(self):
+        self.client = APIClient()
+        self.partner = UserFactory(role="partner")
+        self.establishment = EstablishmentFactory(owner=self.partner)
+        self.beverage = BeverageFactory(establishment=self.establishment)
+        self.url = reverse("v1:order-dashboard", args=[self.establishment.id])
+
+    def test_dashboard(self):
+        orders = [
+            OrderFactory(establishment=self.establishment, beverage=self.beverage)
+            for _ in range(3)
+        ]
+        update_orders_status(self.establishment.id, [orders[0].id], "completed")
+        update_orders_status(self.establishment.id, [orders[1].id], "cancelled")
+        self.client.force_authenticate(self.partner)
+
+        response = self.client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["total_orders"] == 3
+        assert response.data["orders_by_status"]["pending"] == 1
+        assert response.data["completion_rate"] == 0.5
+        assert len(response.data["orders_by_hour"]) == 24
+        assert len(response.data["orders_by_day"]) == 7
+        assert response.data["top_beverages"] == [
+            {"id": self.beverage.id, "name": self.beverage.name, "orders": 3}
+        ]
+
+    def test_constant_queries(self, django_assert_num_queries):
+        for _ in range(5):
+            OrderFactory(
+                establishment=self.establishment,
+                beverage=BeverageFactory(establishment=self.establishment),
+            )
+        self.client.force_authenticate(self.partner)
+
+        # establishment, statuses, hours, days, top beverages
+        with django_assert_num_queries(5):
+            response = self.client.get(self.url)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_other_partner_forbidden(self):
+        self.client.force_authenticate(UserFactory(role="partner"))
+
+        response = self.client.get(self.url)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_admin_allowed(self):
+        self.client.force_authenticate(UserFactory(role="admin"))
+
+        response = self.client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_period_too_long(self):
+        self.client.force_authenticate(self.partner)
+        today = timezone.localdate()
+
+        response = self.client.get(
+            self.url,
+            {
+                "date_from": (today - datetime.timedelta(days=365)).isoformat(),
+                "date_to": today.isoformat(),
+            },
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,11 @@
+from django.urls import path
+
+from .views import OrderDashboardView
+
+urlpatterns = [
+    path(
+        "establishments/<int:pk>/dashboard/",
+        OrderDashboardView.as_view(),
+        name="order-dashboard",
+    ),
+]
@@ -0,0 +1,39 @@
+from drf_spectacular.utils import extend_schema
+from rest_framework.generics import RetrieveAPIView
+from rest_framework.response import Response
+
+from apps.partner.models import Establishment
+from happyhours.permissions import IsAdmin, IsPartnerOwner, IsPartnerUser
+from .queries import order_dashboard
+from .serializers import DashboardPeriodSerializer, OrderDashboardSerializer
+
+
+@extend_schema(
+    tags=["Analytics"],
+    parameters=[DashboardPeriodSerializer],
+    responses=OrderDashboardSerializer,
+)
+class OrderDashboardView(RetrieveAPIView):
+    """
+    Order dashboard of an establishment, for its owner and admins.
+    Totals by status, completion rate, orders per hour of the day, orders
+    per day and the top beverages of the period.
+
+    Read from rollups maintained as orders are placed and updated, the cost
+    does not grow with the order history.
+
+    ### Params:
+    - `date_from`, `date_to`: Local dates (YYYY-MM-DD), inclusive.
+    The last 7 days by default, at most `ANALYTICS_MAX_DAYS` days.
+    """
+
+    queryset = Establishment.objects.select_related("owner")
+    serializer_class = OrderDashboardSerializer
+    permission_classes = [IsPartnerUser, IsPartnerOwner | IsAdmin]
+
+    def retrieve(self, request, *args, **kwargs):
+        period = DashboardPeriodSerializer(data=request.query_params)
+        period.is_valid(raise_exception=True)
+        establishment = self.get_object()
+        dashboard = order_dashboard(establishment.id, **period.validated_data)
+        return Response(self.get_serializer(dashboard).data)
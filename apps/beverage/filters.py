@@ -1,6 +1,5 @@
-from django.utils import timezone
-
 from apps.beverage.models import Beverage
+from apps.partner.models import HappyHourSchedule
 
 from django_filters import rest_framework as filters
 
@@ -19,9 +18,7 @@ class BeverageFilter(filters.FilterSet):
         within their happy hour period.
         """
         if value:
-            current_time = timezone.localtime().time()
             queryset = queryset.filter(
-                establishment__happyhours_start__lte=current_time,
-                establishment__happyhours_end__gte=current_time,
+                establishment_id__in=HappyHourSchedule.objects.active_establishment_ids()
             )
         return queryset
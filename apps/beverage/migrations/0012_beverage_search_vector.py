@@ -0,0 +1,45 @@
+# Generated by Django 4.2 on 2026-10-18 19:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+from apps.partner.search import update_beverage_search_vectors
+
+
+def build_search_vectors(apps, schema_editor):
+    Beverage = apps.get_model("beverage", "Beverage")
+    update_beverage_search_vectors(Beverage.objects.all())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("beverage", "0011_alter_beverage_price"),
+        ("partner", "0012_establishment_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="beverage",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="beverage",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="beverage_search_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="beverage",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"],
+                name="beverage_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.RunPython(build_search_vectors, migrations.RunPython.noop),
+    ]
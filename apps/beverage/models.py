@@ -1,3 +1,5 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 from apps.partner.models import Establishment
@@ -6,9 +8,18 @@ from apps.partner.models import Establishment
 class Category(models.Model):
     name = models.CharField(max_length=100)
 
+    # name as loaded, autocomplete results are only dropped when it changes
+    loaded_name = None
+
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_name = instance.__dict__.get("name")
+        return instance
+
     class Meta:
         verbose_name = "Category"
         verbose_name_plural = "Categories"
@@ -26,11 +37,34 @@ class Beverage(models.Model):
     establishment = models.ForeignKey(
         Establishment, on_delete=models.CASCADE, related_name="beverages"
     )
+    # maintained by signals, see `partner.search.update_beverage_search_vectors`
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    # shown by autocomplete as loaded, its results are only dropped when they change
+    loaded_name = None
+    loaded_availability_status = None
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_name = instance.__dict__.get("name")
+        instance.loaded_availability_status = instance.__dict__.get(
+            "availability_status"
+        )
+        return instance
+
     class Meta:
         verbose_name = "Beverage"
         verbose_name_plural = "Beverages"
         ordering = ["name"]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="beverage_search_idx"),
+            GinIndex(
+                fields=["name"],
+                opclasses=["gin_trgm_ops"],
+                name="beverage_name_trgm_idx",
+            ),
+        ]
@@ -38,7 +38,7 @@ class BeverageSerializer(serializers.ModelSerializer):
 
     def validate_establishment(self, value):
         user = self.context["request"].user
-        if value.owner != user:
+        if value.owner_id != user.id:
             raise serializers.ValidationError("User does not own this establishment.")
         return value
 
@@ -143,3 +143,43 @@ def test_filter_beverage_not_in_happy_hour(
     response = client.get(url)
     assert response.status_code == status.HTTP_200_OK
     assert len(response.data) == 0, "Should find no beverages in happy hour"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("count", [1, 20])
+def test_beverage_list_query_count(
+    client, normal_user, count, django_assert_num_queries
+):
+    BeverageFactory.create_batch(count)
+    client.force_authenticate(user=normal_user)
+
+    # count and page, whatever the page size
+    with django_assert_num_queries(2):
+        response = client.get(reverse("v1:beverage-list") + "?limit=20")
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"]) == count
+
+
+@pytest.mark.django_db
+def test_beverage_detail_query_count(
+    client, normal_user, beverage, django_assert_num_queries
+):
+    client.force_authenticate(user=normal_user)
+
+    with django_assert_num_queries(1):
+        response = client.get(reverse("v1:beverage-detail", args=[beverage.id]))
+    assert response.data["category"] == beverage.category.name
+    assert response.data["establishment"] == beverage.establishment.name
+
+
+@pytest.mark.django_db
+def test_category_list_query_count(client, normal_user, django_assert_num_queries):
+    for category in CategoryFactory.create_batch(5):
+        BeverageFactory.create_batch(2, category=category)
+    client.force_authenticate(user=normal_user)
+
+    # count, page and the beverages of the page
+    with django_assert_num_queries(3):
+        response = client.get(reverse("v1:category-list") + "?limit=20")
+    assert response.status_code == status.HTTP_200_OK
+    assert all(len(item["beverages"]) == 2 for item in response.data["results"])
@@ -1,9 +1,10 @@
+from django.db.models import Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema
 from rest_framework import viewsets, permissions
-from rest_framework.filters import SearchFilter
 
 from happyhours.permissions import IsPartnerOwner, IsAdmin, IsPartnerUser
+from happyhours.search import RankedSearchFilter
 from .filters import BeverageFilter
 from .models import Category, Beverage
 from .serializers import CategorySerializer, BeverageSerializer
@@ -29,10 +30,12 @@ class CategoryViewSet(viewsets.ModelViewSet):
 
     ## Related Fields
     - `beverages`: A list of URLs pointing to detailed views of beverages that belong to a category.
-     This field is read-only.
+     This field is read-only. Beverage ids of a page are fetched in one query.
     """
 
-    queryset = Category.objects.all()
+    queryset = Category.objects.prefetch_related(
+        Prefetch("beverages", queryset=Beverage.objects.only("id", "category"))
+    )
     serializer_class = CategorySerializer
 
     def get_permissions(self):
@@ -56,13 +59,30 @@ class BeverageViewSet(viewsets.ModelViewSet):
 
     ### Validation:
     - The `price` field must be a non-negative number.
+
+    Category and establishment names are joined in the same query, a page
+    costs the same number of queries whatever its size.
+
+    ### Search:
+    - `search` matches words, or word prefixes, of the name, category,
+    establishment name and description, best matches first. Misspelled
+    names are matched by trigram similarity.
     """
 
-    queryset = Beverage.objects.all()
+    queryset = Beverage.objects.select_related("category", "establishment").defer(
+        "search_vector", "establishment__search_vector"
+    )
     serializer_class = BeverageSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter]
+    filter_backends = [DjangoFilterBackend, RankedSearchFilter]
     filterset_class = BeverageFilter
-    search_fields = ["name", "category__name", "establishment__name"]
+    search_trigram_fields = ["name"]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ["update", "partial_update", "destroy"]:
+            # IsPartnerOwner compares the establishment's owner
+            queryset = queryset.select_related("establishment__owner")
+        return queryset
 
     def get_permissions(self):
         if self.action in ["list", "retrieve"]:
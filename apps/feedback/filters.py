@@ -0,0 +1,11 @@
+from django_filters import rest_framework as filters
+
+from .models import Feedback
+
+
+class FeedbackFilter(filters.FilterSet):
+    establishment = filters.NumberFilter(field_name="establishment_id")
+
+    class Meta:
+        model = Feedback
+        fields = ["establishment"]
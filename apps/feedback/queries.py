@@ -0,0 +1,37 @@
+from django.db.models import Prefetch
+
+from .models import Feedback, FeedbackAnswer
+
+
+def feedback_answers_queryset():
+    """
+    Answers with only the columns `FeedbackAnswerSerializer` reads
+    """
+    return (
+        FeedbackAnswer.objects.select_related("user")
+        .only("id", "feedback", "user", "user__email", "created_at", "text")
+        .order_by("created_at", "id")
+    )
+
+
+def feedback_feed_queryset():
+    """
+    Feedback feed for `FeedbackSerializer`: authors and establishments are
+    joined, answers with their authors are prefetched in one extra query,
+    so a page costs the same number of queries whatever its size.
+    """
+    return (
+        Feedback.objects.select_related("user", "establishment")
+        .only(
+            "id",
+            "user",
+            "user__email",
+            "establishment",
+            "establishment__name",
+            "created_at",
+            "text",
+        )
+        .prefetch_related(
+            Prefetch("feedback_answers", queryset=feedback_answers_queryset())
+        )
+    )
@@ -0,0 +1,83 @@
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from happyhours.factories import (
+    EstablishmentFactory,
+    FeedbackAnswerFactory,
+    FeedbackFactory,
+)
+
+FEEDBACK_LIST_URL = "/api/v1/feedback/feedbacks/list/"
+
+
+@pytest.fixture
+def client():
+    return APIClient()
+
+
+@pytest.fixture
+def establishment():
+    return EstablishmentFactory()
+
+
+def create_feed(establishment, size):
+    for _ in range(size):
+        feedback = FeedbackFactory(establishment=establishment)
+        FeedbackAnswerFactory.create_batch(2, feedback=feedback)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("size", [1, 8])
+def test_feedback_list_constant_queries(
+    client, establishment, django_assert_num_queries, size
+):
+    create_feed(establishment, size)
+    # feedback page with joined users and establishments + answers prefetch
+    with django_assert_num_queries(2):
+        response = client.get(FEEDBACK_LIST_URL)
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"]) == size
+    feedback = response.data["results"][0]
+    assert feedback["establishment"] == establishment.name
+    assert len(feedback["feedback_answers"]) == 2
+    assert "@" in feedback["feedback_answers"][0]["user"]
+
+
+@pytest.mark.django_db
+def test_feedback_list_filter_by_establishment(client, establishment):
+    create_feed(establishment, 2)
+    create_feed(EstablishmentFactory(), 3)
+    response = client.get(FEEDBACK_LIST_URL, {"establishment": establishment.id})
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"]) == 2
+
+
+@pytest.mark.django_db
+def test_feedback_list_cursor_pagination(client, establishment):
+    create_feed(establishment, 3)
+    response = client.get(FEEDBACK_LIST_URL, {"page_size": 2})
+    assert len(response.data["results"]) == 2
+    assert response.data["next"]
+
+    response = client.get(response.data["next"])
+    assert len(response.data["results"]) == 1
+    assert response.data["next"] is None
+
+
+@pytest.mark.django_db
+def test_feedback_update_saves_modified_at(client, establishment):
+    feedback = FeedbackFactory(establishment=establishment)
+    modified_at = feedback.modified_at
+    client.force_authenticate(feedback.user)
+
+    response = client.put(
+        f"/api/v1/feedback/feedbacks/{feedback.id}/",
+        {"user": feedback.user.id, "establishment": establishment.id, "text": "Edited"},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    feedback.refresh_from_db()
+    assert feedback.text == "Edited"
+    assert feedback.modified_at > modified_at
@@ -5,9 +5,12 @@ from rest_framework.generics import (
 )
 from rest_framework.permissions import IsAuthenticated
 
+from happyhours.pagination import KeysetPagination
 from happyhours.permissions import IsAdmin
 
+from .filters import FeedbackFilter
 from .models import Feedback, FeedbackAnswer
+from .queries import feedback_feed_queryset
 from .serializers import (
     FeedbackSerializer,
     FeedbackAnswerSerializer,
@@ -27,13 +30,26 @@ class FeedbackListView(ListAPIView):
     - `text`: Content of the feedback
     - `feedback_answers`: Answers to the feedback
 
+    ### Params:
+    - `establishment`: Establishment id
+    - `cursor`: Cursor of the page, taken from `next`/`previous`
+    - `page_size`: Quantity of items
+
     ### Access Control:
     - Everyone
 
+    ### Implementation Details:
+    - Authors, establishments and answers are loaded in a constant number of
+    queries per page
+
     """
 
-    queryset = Feedback.objects.all()
     serializer_class = FeedbackSerializer
+    filterset_class = FeedbackFilter
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        return feedback_feed_queryset()
 
 
 @extend_schema(tags=["Feedbacks"])
@@ -76,9 +92,15 @@ class FeedbackViewSet(FeedbackViewSetService):
 
     """
 
-    queryset = Feedback.objects.all()
     serializer_class = FeedbackSerializer
 
+    def get_queryset(self):
+        # the feed is limited to the columns it shows, updates need the full
+        # row so `modified_at` is saved as well
+        if self.action == "retrieve":
+            return feedback_feed_queryset()
+        return Feedback.objects.all()
+
 
 @extend_schema(tags=["Feedbacks"])
 class FeedbackAnswerCreate(CreateAPIView):
@@ -1,41 +1,79 @@
 import json
+from urllib.parse import parse_qs
+
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
+from django.conf import settings
 
+from happyhours.cache import TTLCache
 from .models import Order
-from .utils import get_user_from_token
-from django.contrib.auth.models import AnonymousUser
+from .utils import (
+    decode_access_token,
+    get_connection_identity,
+    update_orders_status,
+)
 
-from ..partner.models import Establishment
+# access token -> (user id, role) and establishment id -> owner id, so a
+# reconnect wave is mostly served from memory
+token_cache = TTLCache(
+    maxsize=settings.WS_AUTH_CACHE_SIZE, ttl=settings.WS_AUTH_CACHE_TTL
+)
+establishment_owner_cache = TTLCache(
+    maxsize=settings.WS_AUTH_CACHE_SIZE, ttl=settings.WS_AUTH_CACHE_TTL
+)
 
 
 class OrderConsumer(AsyncWebsocketConsumer):
     async def connect(self):
-        token = self.scope['query_string'].decode().split('token=')[1] if 'token=' in self.scope[
-            'query_string'].decode() else None
-        user = await database_sync_to_async(get_user_from_token)(token)
+        query = parse_qs(self.scope['query_string'].decode())
+        token = query.get('token', [None])[0]
+        establishment_id = int(self.scope['url_route']['kwargs']['establishment_id'])
+
+        identity = token_cache.get(token) if token else None
+        owner_id = establishment_owner_cache.get(establishment_id)
+        if token and (identity is None or owner_id is None):
+            identity, owner_id = await self.authorize(token, establishment_id)
 
-        if not user or user.is_anonymous or user.role != 'partner':
+        if not identity or identity[1] != 'partner' or owner_id != identity[0]:
             await self.close()
-        else:
-            self.user = user
+            return
 
-            establishment_id = self.scope['url_route']['kwargs']['establishment_id']
-            establishment = await database_sync_to_async(self.get_establishment)(establishment_id)
+        self.user_id = identity[0]
+        self.establishment_id = establishment_id
+        self.room_group_name = f'order_{establishment_id}'
 
-            if establishment and establishment.owner_id == self.user.id:
-                self.room_group_name = f'order_{establishment_id}'
+        await self.channel_layer.group_add(
+            self.room_group_name,
+            self.channel_name
+        )
 
-                await self.channel_layer.group_add(
-                    self.room_group_name,
-                    self.channel_name
-                )
+        await self.accept()
 
-                await self.accept()
-            else:
-                await self.close()
+    async def authorize(self, token, establishment_id):
+        """
+        Validate the token and load role and owner in one database hop
+        :return: ((user id, role) or None, owner id or None)
+        """
+        decoded = decode_access_token(token)
+        if decoded is None:
+            return None, None
+        user_id, expires_in = decoded
+        row = await database_sync_to_async(get_connection_identity)(
+            user_id, establishment_id
+        )
+        if row is None:
+            return None, None
+
+        identity = (user_id, row['role'])
+        token_cache.set(token, identity, ttl=expires_in)
+        owner_id = row['establishment_owner_id']
+        if owner_id is not None:
+            establishment_owner_cache.set(establishment_id, owner_id)
+        return identity, owner_id
 
     async def disconnect(self, close_code):
+        if not hasattr(self, 'room_group_name'):
+            return
         # Leave room group
         await self.channel_layer.group_discard(
             self.room_group_name,
@@ -43,11 +81,53 @@ class OrderConsumer(AsyncWebsocketConsumer):
         )
 
     async def receive(self, text_data):
-        text_data_json = json.loads(text_data)
-        order_id = text_data_json['order_id']
-        new_status = text_data_json['status']
+        """
+        Update order statuses, either one order
+        `{"order_id": 1, "status": "completed"}` or many at once
+        `{"orders": [1, {"id": 2, "version": 3}], "status": "completed"}`
+        """
+        try:
+            text_data_json = json.loads(text_data)
+            new_status = text_data_json.get('status') or text_data_json.get('new_status')
+            if 'orders' in text_data_json:
+                orders = list(text_data_json['orders'])
+            else:
+                orders = [text_data_json['order_id']]
+        except (ValueError, TypeError, KeyError, AttributeError):
+            await self.send(text_data=json.dumps({'error': 'Invalid message'}))
+            return
+        if new_status not in Order.STATUS_TRANSITIONS:
+            await self.send(text_data=json.dumps({'error': 'Invalid status'}))
+            return
 
-        await self.update_order_status(order_id, new_status)
+        try:
+            applied, rejected = await self.update_order_status(orders, new_status)
+        except (ValueError, TypeError, KeyError):
+            await self.send(text_data=json.dumps({'error': 'Invalid message'}))
+            return
+
+        if applied:
+            if 'orders' in text_data_json:
+                await self.channel_layer.group_send(self.room_group_name, {
+                    'type': 'order_status_update',
+                    'establishment_id': self.establishment_id,
+                    'status': new_status,
+                    'orders': applied,
+                })
+            else:
+                await self.channel_layer.group_send(self.room_group_name, {
+                    'type': 'order_message',
+                    'order_id': applied[0]['order_id'],
+                    'establishment_id': self.establishment_id,
+                    'status': new_status,
+                    'details': 'Status updated',
+                })
+        if rejected:
+            # not in this establishment, stale version or transition not allowed
+            await self.send(text_data=json.dumps({
+                'status': new_status,
+                'rejected': rejected,
+            }))
 
     async def order_message(self, event):
         await self.send(text_data=json.dumps({
@@ -57,19 +137,18 @@ class OrderConsumer(AsyncWebsocketConsumer):
             'details': event['details']
         }))
 
-    @database_sync_to_async
-    def update_order_status(self, order_id, new_status):
-        try:
-            order = Order.objects.get(id=order_id)
-            order.status = new_status
-            order.save()
-            return True
-        except Order.DoesNotExist:
-            return False
+    async def order_batch(self, event):
+        # orders coalesced by the notification dispatcher, one frame per burst
+        await self.send(text_data=json.dumps({'orders': event['orders']}))
+
+    async def order_status_update(self, event):
+        # one acknowledgement for every order changed by a bulk update
+        await self.send(text_data=json.dumps({
+            'establishment_id': event['establishment_id'],
+            'status': event['status'],
+            'orders': event['orders'],
+        }))
 
     @database_sync_to_async
-    def get_establishment(self, establishment_id):
-        try:
-            return Establishment.objects.get(id=establishment_id)
-        except Establishment.DoesNotExist:
-            return None
+    def update_order_status(self, orders, new_status):
+        return update_orders_status(self.establishment_id, orders, new_status)
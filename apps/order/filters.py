@@ -0,0 +1,14 @@
+from django_filters import rest_framework as filters
+
+from .models import Order
+
+
+class OrderHistoryFilter(filters.FilterSet):
+    status = filters.MultipleChoiceFilter(choices=Order.STATUS_CHOICES)
+    establishment = filters.NumberFilter(field_name="establishment_id")
+    date_from = filters.IsoDateTimeFilter(field_name="order_date", lookup_expr="gte")
+    date_to = filters.IsoDateTimeFilter(field_name="order_date", lookup_expr="lte")
+
+    class Meta:
+        model = Order
+        fields = ["status", "establishment", "date_from", "date_to"]
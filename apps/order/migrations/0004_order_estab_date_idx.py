@@ -0,0 +1,19 @@
+# Generated by Django 4.2 on 2026-10-18 17:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0003_order_updated_at_version"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["establishment", "-order_date"], name="order_estab_date_idx"
+            ),
+        ),
+    ]
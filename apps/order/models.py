@@ -15,6 +15,13 @@ class Order(models.Model):
         ('completed', 'Completed'),
         ('cancelled', 'Cancelled'),
     ]
+    # status -> statuses an order may move to from it
+    STATUS_TRANSITIONS = {
+        'pending': ('in_preparation', 'completed', 'cancelled'),
+        'in_preparation': ('completed', 'cancelled'),
+        'completed': (),
+        'cancelled': (),
+    }
     establishment = models.ForeignKey(
         Establishment, on_delete=models.CASCADE, related_name="orders"
     )
@@ -24,3 +31,37 @@ class Order(models.Model):
     client = models.ForeignKey(User, on_delete=models.CASCADE, related_name="orders")
     order_date = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=0)
+
+    # status the instance was loaded with, to tell status changes on save
+    loaded_status = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_status = instance.__dict__.get('status')
+        return instance
+
+    @classmethod
+    def statuses_allowed_to(cls, status):
+        """
+        Statuses an order must be in to be moved to `status`
+        """
+        return [
+            source for source, targets in cls.STATUS_TRANSITIONS.items()
+            if status in targets
+        ]
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["client", "order_date"], name="order_client_date_idx"),
+            models.Index(
+                fields=["client", "establishment", "order_date"],
+                name="order_client_estab_date_idx",
+            ),
+            # partner order history, newest first
+            models.Index(
+                fields=["establishment", "-order_date"], name="order_estab_date_idx"
+            ),
+        ]
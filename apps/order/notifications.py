@@ -0,0 +1,68 @@
+import asyncio
+import logging
+from collections import defaultdict
+
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+from happyhours.background import BackgroundQueue
+
+logger = logging.getLogger(__name__)
+
+
+class OrderNotificationDispatcher(BackgroundQueue):
+    """
+    Sends order events to the `order_{establishment_id}` groups off the
+    request path.
+
+    Events are queued by the request and the background thread collects the
+    burst that arrives within `window` seconds, then sends the events of
+    each group as one `order_batch` message of at most `max_batch` orders.
+    """
+
+    thread_name = "order-notifications"
+
+    def __init__(self, window=None, max_batch=None, autostart=True):
+        super().__init__(
+            window=(
+                window if window is not None else settings.ORDER_NOTIFICATION_WINDOW
+            ),
+            autostart=autostart,
+        )
+        self.max_batch = max_batch or settings.ORDER_NOTIFICATION_MAX_BATCH
+        self._loop = None
+
+    def enqueue(self, group, event):
+        super().enqueue((group, event))
+
+    def handle(self, items):
+        batches = defaultdict(list)
+        for group, event in items:
+            batches[group].append(event)
+        self.send(batches)
+
+    def reset(self):
+        self._loop = None
+
+    def send(self, batches):
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self._send_batches(batches))
+
+    async def _send_batches(self, batches):
+        channel_layer = get_channel_layer()
+        for group, events in batches.items():
+            for start in range(0, len(events), self.max_batch):
+                try:
+                    await channel_layer.group_send(
+                        group,
+                        {
+                            "type": "order_batch",
+                            "orders": events[start : start + self.max_batch],
+                        },
+                    )
+                except Exception:  # pylint: disable=broad-except
+                    logger.exception("Failed to send order notifications to %s", group)
+
+
+order_notifier = OrderNotificationDispatcher()
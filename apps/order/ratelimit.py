@@ -0,0 +1,139 @@
+import datetime
+import logging
+import uuid
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db.models import Count, Q
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import Order
+
+User = get_user_model()
+logger = logging.getLogger(__name__)
+
+PER_DAY_MESSAGE = "You can only place one order per establishment per day."
+PER_HOUR_MESSAGE = "You can only place one order per hour."
+
+
+class OrderRateLimiter:
+    """
+    One order per hour and one order per establishment per day.
+
+    The orders table is the authority: both rules are checked in one
+    aggregated query while holding a row lock on the client, so an evicted,
+    flushed or per-process cache can not let a client past them. Atomic
+    `SET NX` cache keys (Redis in production) in front of it reject repeated
+    requests without touching Postgres and keep concurrent requests of a
+    client from queueing on the lock.
+    """
+
+    def __init__(self, cache_alias="default"):
+        self.cache_alias = cache_alias
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    @staticmethod
+    def get_keys(client, establishment, now):
+        day_key = f"order-quota:day:{client.id}:{establishment.id}:{now.date()}"
+        hour_key = f"order-quota:hour:{client.id}"
+        return day_key, hour_key
+
+    def acquire(self, client, establishment):
+        """
+        Reserve the quotas for a new order. Must run inside a transaction,
+        the client row lock is held until it ends
+        :param client:
+        :param establishment:
+        :return: reserved cache keys, empty when the cache is unavailable
+        """
+        now = timezone.localtime()
+        keys = self.acquire_cache(client, establishment, now)
+        try:
+            self.check_database(client, establishment, now)
+        except serializers.ValidationError:
+            self.release(keys)
+            raise
+        return keys
+
+    def acquire_cache(self, client, establishment, now):
+        """
+        Fast reject: a key is held while an order of the quota exists or is
+        being placed
+        """
+        day_key, hour_key = self.get_keys(client, establishment, now)
+        tomorrow = (now + datetime.timedelta(days=1)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        token = uuid.uuid4().hex
+        day_acquired = False
+        try:
+            day_acquired = self.cache.add(
+                day_key, token, int((tomorrow - now).total_seconds()) + 1
+            )
+            hour_acquired = day_acquired and self.cache.add(hour_key, token, 60 * 60)
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Order rate limit cache unavailable", exc_info=True)
+            # a day key left behind would reject the next order of the day
+            if day_acquired:
+                self.release([day_key])
+            return []
+
+        if not day_acquired:
+            raise serializers.ValidationError(PER_DAY_MESSAGE)
+        if not hour_acquired:
+            self.release([day_key])
+            raise serializers.ValidationError(PER_HOUR_MESSAGE)
+        return [day_key, hour_key]
+
+    def release(self, keys):
+        if not keys:
+            return
+        try:
+            self.cache.delete_many(keys)
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Order rate limit cache unavailable", exc_info=True)
+
+    @contextmanager
+    def reserve(self, client, establishment):
+        """
+        Reserve the quotas for the block, they are released if it fails.
+        Must run inside a transaction for the client row lock.
+        """
+        keys = self.acquire(client, establishment)
+        try:
+            yield
+        except Exception:
+            self.release(keys)
+            raise
+
+    def check_database(self, client, establishment, now=None):
+        """
+        Both rules in one aggregated query over the (client, order_date)
+        index, serialized per client by a row lock
+        """
+        now = now or timezone.localtime()
+        one_hour_ago = now - datetime.timedelta(hours=1)
+        today_min = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        User.objects.select_for_update().filter(pk=client.pk).exists()
+        counts = Order.objects.filter(
+            client=client, order_date__gte=min(one_hour_ago, today_min)
+        ).aggregate(
+            same_day=Count(
+                "id", filter=Q(establishment=establishment, order_date__gte=today_min)
+            ),
+            last_hour=Count("id", filter=Q(order_date__gte=one_hour_ago)),
+        )
+
+        if counts["same_day"]:
+            raise serializers.ValidationError(PER_DAY_MESSAGE)
+        if counts["last_hour"]:
+            raise serializers.ValidationError(PER_HOUR_MESSAGE)
+
+
+order_rate_limiter = OrderRateLimiter()
@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent by `update_orders_status` after its UPDATE, which does not send
+# post_save. `changes` is a list of (establishment_id, beverage_id,
+# order_date, old_status, new_status)
+orders_status_changed = Signal()
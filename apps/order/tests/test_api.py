@@ -1,4 +1,7 @@
+import datetime
+
 import pytest
+from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.urls import reverse
@@ -42,6 +45,19 @@ class TestOrderViews:
         assert response.data["client"] == user.id
         assert response.data["establishment"] == beverage.establishment.id
 
+    def test_place_order_rate_limited(self):
+        establishment = EstablishmentFactory(
+            happyhours_start="00:00:00", happyhours_end="23:59:59"
+        )
+        beverage = BeverageFactory(establishment=establishment)
+        user = UserFactory(role="client")
+        self.client.force_authenticate(user=user)
+        response = self.client.post(self.place_order_url, {"beverage": beverage.id})
+        assert response.status_code == status.HTTP_201_CREATED
+        response = self.client.post(self.place_order_url, {"beverage": beverage.id})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Order.objects.filter(client=user).count() == 1
+
     def test_client_order_history_permissions(self):
         response = self.client.get(self.client_order_history_url)
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -49,7 +65,10 @@ class TestOrderViews:
         self.client.force_authenticate(user=self.user)
         response = self.client.get(self.client_order_history_url)
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == Order.objects.filter(client=self.user).count()
+        assert (
+            len(response.data["results"])
+            == Order.objects.filter(client=self.user).count()
+        )
 
     def test_partner_order_history_permissions(self):
         response = self.client.get(self.partner_order_history_url)
@@ -63,6 +82,64 @@ class TestOrderViews:
         self.client.force_authenticate(user=self.partner)
         response = self.client.get(self.partner_order_history_url)
         assert (
-            len(response.data)
+            len(response.data["results"])
             == Order.objects.filter(establishment__owner=self.partner).count()
         )
+
+    def test_client_order_history_cursor_pages(self):
+        OrderFactory.create_batch(2, client=self.user)
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(self.client_order_history_url, {"page_size": 2})
+        assert len(response.data["results"]) == 2
+        assert "count" not in response.data
+        dates = [order["order_date"] for order in response.data["results"]]
+        assert dates == sorted(dates, reverse=True)
+
+        response = self.client.get(response.data["next"])
+        assert len(response.data["results"]) == 1
+        assert response.data["next"] is None
+
+    def test_client_order_history_legacy_offset(self):
+        OrderFactory.create_batch(2, client=self.user)
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(
+            self.client_order_history_url, {"limit": 2, "offset": 2}
+        )
+        assert response.data["count"] == 3
+        assert len(response.data["results"]) == 1
+
+    def test_client_order_history_exact_count(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.client_order_history_url, {"count": "exact"})
+        assert response.data["count"] == 1
+
+    @pytest.mark.parametrize("size", [1, 5])
+    def test_partner_order_history_single_query(self, django_assert_num_queries, size):
+        OrderFactory.create_batch(size, establishment=self.establishment)
+        self.client.force_authenticate(user=self.partner)
+
+        with django_assert_num_queries(1):
+            response = self.client.get(self.partner_order_history_url)
+        assert len(response.data["results"]) == size
+        assert response.data["results"][0]["establishment_name"] == self.establishment.name
+
+    def test_partner_order_history_filters(self):
+        OrderFactory(establishment=self.establishment, status="completed")
+        OrderFactory(establishment=self.establishment, status="cancelled")
+        old = OrderFactory(establishment=self.establishment, status="completed")
+        Order.objects.filter(id=old.id).update(
+            order_date=timezone.now() - datetime.timedelta(days=30)
+        )
+        self.client.force_authenticate(user=self.partner)
+
+        response = self.client.get(
+            self.partner_order_history_url,
+            {
+                "status": "completed",
+                "date_from": (timezone.now() - datetime.timedelta(days=1)).isoformat(),
+            },
+        )
+        assert len(response.data["results"]) == 1
+        assert response.data["results"][0]["status"] == "completed"
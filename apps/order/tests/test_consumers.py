@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import pytest
 from channels.db import database_sync_to_async
 from channels.routing import URLRouter
@@ -6,7 +8,7 @@ from django.contrib.auth import get_user_model
 from django.urls import path
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from ..consumers import OrderConsumer
+from ..consumers import OrderConsumer, establishment_owner_cache, token_cache
 from happyhours.factories import UserFactory, EstablishmentFactory, OrderFactory
 
 User = get_user_model()
@@ -70,4 +72,64 @@ class TestOrderConsumerJwtAuth:
         _, _, establishment, _, _ = await setup_data
         communicator, connected = await self.setup_communicator(establishment.id, 'invalid_token')
         assert not connected, "Connection should fail for invalid token"
-        await communicator.disconnect()
\ No newline at end of file
+        await communicator.disconnect()
+
+    async def test_reconnect_served_from_cache(self, setup_data):
+        _, owner, establishment, _, tokens = await setup_data
+        token_cache.clear()
+        establishment_owner_cache.clear()
+        communicator, connected = await self.setup_communicator(establishment.id, tokens['access'])
+        assert connected
+        await communicator.disconnect()
+
+        with patch('apps.order.consumers.get_connection_identity') as mock_identity:
+            communicator, connected = await self.setup_communicator(
+                establishment.id, tokens['access']
+            )
+            assert connected, "Reconnect should be authorized from the cache"
+            mock_identity.assert_not_called()
+        await communicator.disconnect()
+
+    async def test_connection_to_not_owned_establishment(self, setup_data):
+        _, _, _, _, tokens = await setup_data
+        other = await database_sync_to_async(EstablishmentFactory)()
+        communicator, connected = await self.setup_communicator(other.id, tokens['access'])
+        assert not connected, "Connection should fail for establishment of another owner"
+        await communicator.disconnect()
+
+    async def test_bulk_order_update(self, setup_data):
+        client, owner, establishment, order, tokens = await setup_data
+        second = await database_sync_to_async(OrderFactory)(
+            establishment=establishment, client=client
+        )
+        foreign = await database_sync_to_async(OrderFactory)(client=client)
+        communicator, connected = await self.setup_communicator(establishment.id, tokens['access'])
+        assert connected
+
+        await communicator.send_json_to({
+            'orders': [order.id, {'id': second.id, 'version': 0}, foreign.id],
+            'status': 'in_preparation',
+        })
+        first = await communicator.receive_json_from()
+        second_frame = await communicator.receive_json_from()
+        frames = {'orders' in first: first, 'orders' in second_frame: second_frame}
+
+        assert frames[True] == {
+            'establishment_id': establishment.id,
+            'status': 'in_preparation',
+            'orders': [
+                {'order_id': order.id, 'status': 'in_preparation', 'version': 1},
+                {'order_id': second.id, 'status': 'in_preparation', 'version': 1},
+            ],
+        }
+        assert frames[False] == {'status': 'in_preparation', 'rejected': [foreign.id]}
+        await communicator.disconnect()
+
+    async def test_invalid_status(self, setup_data):
+        _, _, establishment, order, tokens = await setup_data
+        communicator, connected = await self.setup_communicator(establishment.id, tokens['access'])
+        assert connected
+
+        await communicator.send_json_to({'orders': [order.id], 'status': 'eaten'})
+        assert await communicator.receive_json_from() == {'error': 'Invalid status'}
+        await communicator.disconnect()
@@ -0,0 +1,52 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from happyhours.factories import OrderFactory
+from ..notifications import OrderNotificationDispatcher
+from ..utils import send_order_notification
+
+
+def event(order_id, establishment_id):
+    return {
+        "order_id": order_id,
+        "establishment_id": establishment_id,
+        "status": "pending",
+        "details": f"New order {order_id}",
+    }
+
+
+def test_events_coalesced_per_group():
+    dispatcher = OrderNotificationDispatcher(max_batch=2, autostart=False)
+    for order_id in range(3):
+        dispatcher.enqueue("order_1", event(order_id, 1))
+    dispatcher.enqueue("order_2", event(3, 2))
+
+    with patch.object(dispatcher, "send") as mock_send:
+        dispatcher.flush()
+    batches = mock_send.call_args.args[0]
+    assert [item["order_id"] for item in batches["order_1"]] == [0, 1, 2]
+    assert [item["order_id"] for item in batches["order_2"]] == [3]
+
+
+def test_batches_split_by_max_batch():
+    dispatcher = OrderNotificationDispatcher(max_batch=2, autostart=False)
+    for order_id in range(3):
+        dispatcher.enqueue("order_1", event(order_id, 1))
+
+    with patch("apps.order.notifications.get_channel_layer") as mock_layer:
+        mock_layer.return_value.group_send = mock_group_send = AsyncMock()
+        dispatcher.flush()
+    frames = [call.args[1]["orders"] for call in mock_group_send.call_args_list]
+    assert [len(frame) for frame in frames] == [2, 1]
+    assert mock_group_send.call_args.args[1]["type"] == "order_batch"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_notification_queued_after_commit():
+    order = OrderFactory()
+    with patch("apps.order.utils.order_notifier") as mock_notifier:
+        send_order_notification(order)
+    group, message = mock_notifier.enqueue.call_args.args
+    assert group == f"order_{order.establishment_id}"
+    assert message["order_id"] == order.id
@@ -0,0 +1,97 @@
+import datetime
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from happyhours.factories import EstablishmentFactory, OrderFactory, UserFactory
+from ..models import Order
+from ..ratelimit import OrderRateLimiter
+
+
+@pytest.fixture
+def limiter():
+    cache.clear()
+    return OrderRateLimiter()
+
+
+@pytest.fixture
+def client_user():
+    return UserFactory(role="client")
+
+
+@pytest.mark.django_db
+def test_second_order_same_establishment_rejected(
+    limiter, client_user, django_assert_num_queries
+):
+    establishment = EstablishmentFactory()
+    keys = limiter.acquire(client_user, establishment)
+    assert len(keys) == 2
+    # rejected by the cache key, without querying
+    with django_assert_num_queries(0):
+        with pytest.raises(ValidationError, match="per establishment per day"):
+            limiter.acquire(client_user, establishment)
+
+
+@pytest.mark.django_db
+def test_lost_cache_keys_do_not_lift_limits(limiter, client_user):
+    establishment = EstablishmentFactory()
+    OrderFactory(client=client_user, establishment=establishment)
+    cache.clear()
+
+    with pytest.raises(ValidationError, match="per establishment per day"):
+        limiter.acquire(client_user, establishment)
+    # the keys taken for the rejected order are handed back
+    day_key, hour_key = limiter.get_keys(
+        client_user, establishment, timezone.localtime()
+    )
+    assert cache.get_many([day_key, hour_key]) == {}
+
+
+@pytest.mark.django_db
+def test_second_order_within_hour_rejected(limiter, client_user):
+    limiter.acquire(client_user, EstablishmentFactory())
+    other = EstablishmentFactory()
+    with pytest.raises(ValidationError, match="one order per hour"):
+        limiter.acquire(client_user, other)
+    # the day quota of the rejected establishment is handed back
+    day_key, _ = limiter.get_keys(client_user, other, timezone.localtime())
+    assert cache.get(day_key) is None
+
+
+@pytest.mark.django_db
+def test_failed_order_releases_quota(limiter, client_user):
+    establishment = EstablishmentFactory()
+    with pytest.raises(RuntimeError):
+        with limiter.reserve(client_user, establishment):
+            raise RuntimeError
+    assert len(limiter.acquire(client_user, establishment)) == 2
+
+
+@pytest.mark.django_db
+def test_database_fallback(limiter, client_user):
+    establishment = EstablishmentFactory()
+    order = OrderFactory(client=client_user, establishment=establishment)
+    with patch.object(OrderRateLimiter, "cache") as mock_cache:
+        mock_cache.add.side_effect = ConnectionError
+        with pytest.raises(ValidationError, match="per establishment per day"):
+            limiter.acquire(client_user, establishment)
+
+        Order.objects.filter(id=order.id).update(
+            order_date=timezone.now() - datetime.timedelta(days=2)
+        )
+        assert limiter.acquire(client_user, establishment) == []
+
+
+@pytest.mark.django_db
+def test_cache_failure_releases_day_key(limiter, client_user):
+    establishment = EstablishmentFactory()
+    with patch.object(OrderRateLimiter, "cache") as mock_cache:
+        # the day key is taken, the cache fails on the hour key
+        mock_cache.add.side_effect = [True, ConnectionError]
+        assert limiter.acquire(client_user, establishment) == []
+
+    day_key, _ = limiter.get_keys(client_user, establishment, timezone.localtime())
+    mock_cache.delete_many.assert_called_once_with([day_key])
@@ -3,6 +3,7 @@ from unittest.mock import patch, Mock
 from django.utils import timezone
 import datetime
 from rest_framework.exceptions import ValidationError
+from apps.partner.models import HappyHourSchedule
 from happyhours.factories import UserFactory, BeverageFactory, EstablishmentFactory
 from ..serializers import OrderSerializer
 
@@ -54,6 +55,7 @@ def test_get_default_establishment(beverage):
 def test_validate_order_happyhours_inside(mock_time, establishment, user, beverage):
     establishment.happyhours_start = datetime.time(10, 0)
     establishment.happyhours_end = datetime.time(12, 0)
+    establishment.save()
     serializer = OrderSerializer()
     serializer.validate_order_happyhours(establishment)
 
@@ -68,47 +70,36 @@ def test_validate_order_happyhours_inside(mock_time, establishment, user, bevera
 def test_validate_order_happyhours_outside(mock_time, establishment, user, beverage):
     establishment.happyhours_start = datetime.time(10, 0)
     establishment.happyhours_end = datetime.time(12, 0)
+    establishment.save()
     serializer = OrderSerializer()
     with pytest.raises(ValidationError):
         serializer.validate_order_happyhours(establishment)
 
 
-@pytest.mark.django_db
-@patch("django.utils.timezone.localtime")
-@patch("apps.order.models.Order.objects.filter")
-def test_validate_order_per_hour(mock_filter, mock_time, user, beverage):
-    mock_time.return_value = timezone.now()
-    mock_filter.return_value.exists.return_value = True
-    serializer = OrderSerializer()
-    with pytest.raises(ValidationError):
-        serializer.validate_order_per_hour(user)
-
-
-@pytest.mark.django_db
-@patch("django.utils.timezone.localtime")
-@patch("apps.order.models.Order.objects.filter")
-def test_validate_order_per_day(mock_filter, mock_time, user, establishment):
-    mock_time.return_value = timezone.now()
-    mock_filter.return_value.exists.return_value = True
-    serializer = OrderSerializer()
-    with pytest.raises(ValidationError):
-        serializer.validate_order_per_day(user, establishment)
-
-
 @pytest.mark.django_db
 def test_serializer_validate_integration(user, beverage):
     with patch.object(
         OrderSerializer, "validate_order_happyhours"
-    ) as mock_happyhours, patch.object(
-        OrderSerializer, "validate_order_per_hour"
-    ) as mock_per_hour, patch.object(
-        OrderSerializer, "validate_order_per_day"
-    ) as mock_per_day:
+    ) as mock_happyhours:
         serializer = OrderSerializer(context={"request": Mock(user=user)})
         data = {"beverage": beverage}
         validated_data = serializer.validate(data)
         assert "client" in validated_data
         assert "establishment" in validated_data
         mock_happyhours.assert_called_once()
-        mock_per_hour.assert_called_once()
-        mock_per_day.assert_called_once()
+
+
+@pytest.mark.django_db
+@patch(
+    "django.utils.timezone.localtime",
+    return_value=timezone.make_aware(
+        datetime.datetime.combine(datetime.date.today(), datetime.time(13, 0))
+    ),
+)
+def test_validate_order_happyhours_custom_schedule(mock_time, establishment, user, beverage):
+    HappyHourSchedule.rebuild_for(
+        establishment,
+        [(datetime.date.today().weekday(), datetime.time(12, 0), datetime.time(14, 0))],
+    )
+    serializer = OrderSerializer()
+    serializer.validate_order_happyhours(establishment)
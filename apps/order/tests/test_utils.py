@@ -0,0 +1,66 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from happyhours.factories import OrderFactory
+from ..models import Order
+from ..utils import update_orders_status
+
+
+@pytest.mark.django_db
+class TestUpdateOrdersStatus:
+    def test_single_update_for_many_orders(self):
+        order = OrderFactory()
+        other = OrderFactory(establishment=order.establishment)
+
+        with CaptureQueriesContext(connection) as context:
+            applied, rejected = update_orders_status(
+                order.establishment_id, [order.id, other.id], 'completed'
+            )
+
+        # SELECT FOR UPDATE and UPDATE, whatever the number of orders
+        order_queries = [
+            query for query in context.captured_queries
+            if '"order_order"' in query['sql']
+        ]
+        assert len(order_queries) == 2
+
+        assert [row['order_id'] for row in applied] == sorted([order.id, other.id])
+        assert rejected == []
+        assert set(Order.objects.values_list('status', flat=True)) == {'completed'}
+
+    def test_other_establishment_is_rejected(self):
+        order = OrderFactory()
+        foreign = OrderFactory()
+
+        applied, rejected = update_orders_status(
+            order.establishment_id, [foreign.id], 'completed'
+        )
+
+        assert applied == []
+        assert rejected == [foreign.id]
+        foreign.refresh_from_db()
+        assert foreign.status == 'pending'
+
+    def test_transition_not_allowed(self):
+        order = OrderFactory(status='completed')
+
+        applied, rejected = update_orders_status(
+            order.establishment_id, [order.id], 'pending'
+        )
+
+        assert applied == []
+        assert rejected == [order.id]
+
+    def test_stale_version_is_rejected(self):
+        order = OrderFactory()
+        update_orders_status(order.establishment_id, [order.id], 'in_preparation')
+
+        applied, rejected = update_orders_status(
+            order.establishment_id, [{'id': order.id, 'version': 0}], 'completed'
+        )
+
+        assert applied == []
+        assert rejected == [order.id]
+        order.refresh_from_db()
+        assert (order.status, order.version) == ('in_preparation', 1)
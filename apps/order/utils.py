@@ -1,28 +1,124 @@
-from asgiref.sync import async_to_sync
-from channels.layers import get_channel_layer
-from django.contrib.auth.models import AnonymousUser
-from rest_framework_simplejwt.tokens import AccessToken
+import time
+
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, Q, Subquery
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.partner.models import Establishment
+from .models import Order
+from .notifications import order_notifier
+from .signals import orders_status_changed
 
 User = get_user_model()
 
 
-def get_user_from_token(token):
+def decode_access_token(token):
+    """
+    Validate an access token without touching the database
+    :param token:
+    :return: (user id, seconds until expiry) or None if the token is invalid
+    """
     try:
         decoded_data = AccessToken(token)
-        user_id = decoded_data['user_id']
-        return User.objects.get(id=user_id)
-    except Exception as e:
-        return AnonymousUser()
+    except TokenError:
+        return None
+    return decoded_data['user_id'], decoded_data['exp'] - time.time()
+
+
+def get_connection_identity(user_id, establishment_id):
+    """
+    Role of the user and owner of the establishment in a single query
+    :return: dict with `role` and `establishment_owner_id` or None if the
+    user does not exist
+    """
+    owner = Establishment.objects.filter(id=establishment_id).values('owner_id')[:1]
+    return (
+        User.objects.filter(id=user_id)
+        .annotate(establishment_owner_id=Subquery(owner))
+        .values('role', 'establishment_owner_id')
+        .first()
+    )
+
+
+def update_orders_status(establishment_id, orders, status):
+    """
+    Move orders of an establishment to `status` with one SELECT FOR UPDATE
+    and a single UPDATE. Only orders whose current status may transition to
+    `status` are changed; an order given with a `version` is changed only if
+    it still has that version, so a stale client can not overwrite a newer
+    change
+    :param establishment_id:
+    :param orders: order ids or dicts with `id` and optional `version`
+    :param status:
+    :return: (applied, rejected) - applied is a list of dicts with
+    `order_id`, `status` and `version`, rejected is a list of order ids
+    """
+    expected = {}
+    for item in orders:
+        if isinstance(item, dict):
+            expected[int(item['id'])] = item.get('version')
+        else:
+            expected[int(item)] = None
+    sources = Order.statuses_allowed_to(status)
+    if not expected or not sources:
+        return [], list(expected)
+
+    condition = Q()
+    unversioned = [order_id for order_id, version in expected.items() if version is None]
+    if unversioned:
+        condition |= Q(id__in=unversioned)
+    for order_id, version in expected.items():
+        if version is not None:
+            condition |= Q(id=order_id, version=version)
+
+    with transaction.atomic():
+        # lock the matching rows, so the statuses they are moved from are known
+        rows = list(
+            Order.objects.select_for_update()
+            .filter(condition, establishment_id=establishment_id, status__in=sources)
+            .order_by('id')
+            .values('id', 'status', 'version', 'beverage_id', 'order_date')
+        )
+        if rows:
+            Order.objects.filter(id__in=[row['id'] for row in rows]).update(
+                status=status, version=F('version') + 1, updated_at=timezone.now()
+            )
+            orders_status_changed.send(
+                sender=Order,
+                changes=[
+                    (
+                        establishment_id,
+                        row['beverage_id'],
+                        row['order_date'],
+                        row['status'],
+                        status,
+                    )
+                    for row in rows
+                ],
+            )
+
+    applied = [
+        {'order_id': row['id'], 'status': status, 'version': row['version'] + 1}
+        for row in rows
+    ]
+    applied_ids = {row['order_id'] for row in applied}
+    rejected = [order_id for order_id in expected if order_id not in applied_ids]
+    return applied, rejected
+
 
 def send_order_notification(order):
-    channel_layer = get_channel_layer()
+    """
+    Queue a new order event for the establishment's WebSocket group, it is
+    sent in a batch once the transaction commits
+    """
     message = {
-        'type': 'order_message',
         'order_id': order.id,
-        'establishment_id': order.establishment.id,
+        'establishment_id': order.establishment_id,
         'status': order.status,
         'details': f"New order {order.id} for {order.beverage.name}"
     }
     group_name = f'order_{order.establishment_id}'
-    async_to_sync(channel_layer.group_send)(group_name, message)
\ No newline at end of file
+    transaction.on_commit(lambda: order_notifier.enqueue(group_name, message))
@@ -1,13 +1,15 @@
+from django.db import transaction
 from drf_spectacular.utils import extend_schema
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.viewsets import ReadOnlyModelViewSet
 
-from apps.beverage.models import Beverage
+from apps.order.filters import OrderHistoryFilter
 from apps.order.models import Order
+from apps.order.ratelimit import order_rate_limiter
 from apps.order.serializers import OrderSerializer, OrderHistorySerializer
 from apps.order.utils import send_order_notification
-from apps.partner.models import Establishment
+from happyhours.pagination import KeysetPagination
 from happyhours.permissions import IsPartnerUser
 
 
@@ -18,6 +20,10 @@ class PlaceOrderView(generics.CreateAPIView):
 
     The endpoint expects beverage ID as part of the request, and automatically sets the order's client
     to the current user and the establishment to the one associated with the specified beverage.
+
+    One order per hour and one order per establishment per day are enforced by
+    `order_rate_limiter`: checked against the orders table under a lock on the
+    client, repeated requests are rejected early by atomic cache reservations.
     """
 
     queryset = Order.objects.all()
@@ -25,43 +31,77 @@ class PlaceOrderView(generics.CreateAPIView):
     permission_classes = [IsAuthenticated]
 
     def perform_create(self, serializer):
-        beverage_id = serializer.validated_data.get("beverage").id
-        beverage = Beverage.objects.get(id=beverage_id)
-        order = serializer.save(client=self.request.user, establishment=beverage.establishment)
+        # client and establishment are resolved by the serializer
+        client = serializer.validated_data["client"]
+        establishment = serializer.validated_data["establishment"]
+        with transaction.atomic(), order_rate_limiter.reserve(client, establishment):
+            order = serializer.save()
         send_order_notification(order)
 
 
+class OrderHistoryMixin:
+    """
+    Orders with establishment and beverage names joined in the same query
+    """
+
+    serializer_class = OrderHistorySerializer
+    pagination_class = KeysetPagination
+    filterset_class = OrderHistoryFilter
+    keyset_ordering = "-order_date"
+
+    def get_history_queryset(self):
+        return Order.objects.select_related("establishment", "beverage").only(
+            "id",
+            "order_date",
+            "status",
+            "client_id",
+            "establishment__name",
+            "beverage__name",
+        )
+
+
 @extend_schema(tags=["Orders"])
-class ClientOrderHistoryView(ReadOnlyModelViewSet):
+class ClientOrderHistoryView(OrderHistoryMixin, ReadOnlyModelViewSet):
     """
     ViewSet for viewing a client's own order history.
     Provides endpoints for listing all orders associated
     with the authenticated client and for retrieving details of a specific order.
+    Newest orders first, paged by cursor on `order_date`.
+
+    ### Params:
+    - `status`: Order status, can be repeated
+    - `date_from`, `date_to`: Order date range (ISO 8601)
+    - `establishment`: Establishment id
     """
 
-    serializer_class = OrderHistorySerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Order.objects.filter(client=self.request.user)
+        return self.get_history_queryset().filter(client_id=self.request.user.id)
 
 
 @extend_schema(tags=["Orders"])
-class PartnerOrderHistoryView(ReadOnlyModelViewSet):
+class PartnerOrderHistoryView(OrderHistoryMixin, ReadOnlyModelViewSet):
     """
     ViewSet for viewing order history for partners.
     Lists all orders related to establishments owned by the authenticated partner and
     allows retrieving specific orders.
 
     This viewset supports listing all such orders and retrieving details for a specific order.
+    Newest orders first, paged by cursor on `order_date`.
+
+    ### Params:
+    - `status`: Order status, can be repeated
+    - `date_from`, `date_to`: Order date range (ISO 8601)
+    - `establishment`: Establishment id
     """
 
-    serializer_class = OrderHistorySerializer
     permission_classes = [IsPartnerUser]
 
     def get_queryset(self):
         """
         This queryset returns orders for the establishments owned by the logged-in user.
         """
-        owned_establishments = Establishment.objects.filter(owner=self.request.user)
-        return Order.objects.filter(establishment__in=owned_establishments)
+        return self.get_history_queryset().filter(
+            establishment__owner_id=self.request.user.id
+        )
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.gis import admin as gis_admin
 
-from .models import Establishment
+from .models import Establishment, HappyHourSchedule
 
 
 class EstablishmentAdmin(gis_admin.OSMGeoAdmin):
@@ -9,3 +9,4 @@ class EstablishmentAdmin(gis_admin.OSMGeoAdmin):
 
 
 admin.site.register(Establishment, EstablishmentAdmin)
+admin.site.register(HappyHourSchedule)
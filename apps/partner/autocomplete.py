@@ -0,0 +1,122 @@
+import datetime
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import IntegerField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from happyhours.cache import TTLCache
+from .models import Establishment
+from ..analytics.models import OrderRollup
+from ..beverage.models import Beverage, Category
+
+GENERATION_KEY = "autocomplete:generation"
+
+# (generation, prefix, limit) -> results, hot prefixes stay in process
+autocomplete_cache = TTLCache(
+    maxsize=settings.AUTOCOMPLETE_CACHE_SIZE, ttl=settings.AUTOCOMPLETE_CACHE_TTL
+)
+
+
+def get_generation():
+    """
+    Shared by every process, a new generation makes their cached results
+    unreachable
+    """
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, uuid.uuid4().hex, timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def invalidate_autocomplete():
+    cache.set(GENERATION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def normalize_prefix(text):
+    return " ".join(text.lower().split())[: settings.AUTOCOMPLETE_MAX_LENGTH]
+
+
+def _popularity(**lookups):
+    """
+    Orders counted in the rollups of the last AUTOCOMPLETE_POPULARITY_DAYS
+    """
+    since = timezone.localdate() - datetime.timedelta(
+        days=settings.AUTOCOMPLETE_POPULARITY_DAYS
+    )
+    orders = (
+        OrderRollup.objects.filter(date__gte=since, **lookups)
+        .order_by()
+        .values(*lookups)
+        .annotate(total=Sum("count"))
+        .values("total")
+    )
+    return Coalesce(Subquery(orders, output_field=IntegerField()), 0)
+
+
+def _matches(queryset, prefix, popularity, kind, limit):
+    """
+    Names starting with the prefix or with a word starting with it, both
+    served by the trigram index on `name`
+    """
+    rows = (
+        queryset.filter(Q(name__istartswith=prefix) | Q(name__icontains=f" {prefix}"))
+        .annotate(popularity=popularity)
+        .order_by("-popularity", "name", "id")
+        .values("id", "name", "popularity")[:limit]
+    )
+    return [dict(row, type=kind) for row in rows]
+
+
+def search_names(prefix, limit):
+    """
+    Establishments, available beverages and categories whose names match
+    the prefix, the most ordered first. One query per type
+    """
+    candidates = (
+        _matches(
+            Establishment.objects.all(),
+            prefix,
+            _popularity(establishment=OuterRef("pk")),
+            "establishment",
+            limit,
+        )
+        + _matches(
+            Beverage.objects.filter(availability_status=True),
+            prefix,
+            _popularity(beverage=OuterRef("pk")),
+            "beverage",
+            limit,
+        )
+        + _matches(
+            Category.objects.all(),
+            prefix,
+            _popularity(beverage__category=OuterRef("pk")),
+            "category",
+            limit,
+        )
+    )
+    candidates.sort(key=lambda row: (-row["popularity"], row["name"].lower()))
+    return [
+        {"id": row["id"], "name": row["name"], "type": row["type"]}
+        for row in candidates[:limit]
+    ]
+
+
+def autocomplete(text, limit):
+    """
+    Cached `search_names`, entries of an older generation are never read
+    :return: list of dicts with `id`, `name` and `type`
+    """
+    prefix = normalize_prefix(text)
+    if not prefix:
+        return []
+    key = (get_generation(), prefix, limit)
+    results = autocomplete_cache.get(key)
+    if results is None:
+        results = search_names(prefix, limit)
+        autocomplete_cache.set(key, results)
+    return results
@@ -0,0 +1,76 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .filters import MenuFilter
+from .models import Establishment
+from ..beverage.models import Beverage
+from ..beverage.serializers import BeverageSerializer
+
+
+def _state_key(establishment_id):
+    return f"menu:{establishment_id}:state"
+
+
+def get_menu_state(establishment_id):
+    """
+    Cached owner and version of an establishment's menu.
+    :param establishment_id:
+    :return: dict or None if the establishment does not exist
+    """
+    state = cache.get(_state_key(establishment_id))
+    if state is None:
+        establishment = (
+            Establishment.objects.filter(id=establishment_id).values("owner_id").first()
+        )
+        if establishment is None:
+            return None
+        state = {
+            "owner_id": establishment["owner_id"],
+            "version": uuid.uuid4().hex,
+        }
+        cache.set(_state_key(establishment_id), state, settings.MENU_CACHE_TIMEOUT)
+    return state
+
+
+def get_menu(establishment_id, state, is_owner, category=""):
+    """
+    Serialized menu of an establishment. Owners also see unavailable beverages.
+    :param establishment_id:
+    :param state: result of `get_menu_state`
+    :param is_owner:
+    :param category: `MenuFilter` category lookup
+    :return: list of serialized beverages
+    """
+    category_hash = hashlib.md5(category.encode()).hexdigest()
+    audience = "owner" if is_owner else "public"
+    key = f"menu:{establishment_id}:{state['version']}:{audience}:{category_hash}"
+    menu = cache.get(key)
+    if menu is None:
+        queryset = Beverage.objects.filter(
+            establishment_id=establishment_id
+        ).select_related("category", "establishment")
+        if not is_owner:
+            queryset = queryset.filter(availability_status=True)
+        if category:
+            queryset = MenuFilter({"category": category}, queryset=queryset).qs
+        menu = [dict(item) for item in BeverageSerializer(queryset, many=True).data]
+        cache.set(key, menu, settings.MENU_CACHE_TIMEOUT)
+    return menu
+
+
+def get_menu_etag(state, is_owner, full_path):
+    path_hash = hashlib.md5(full_path.encode()).hexdigest()
+    audience = "owner" if is_owner else "public"
+    return f'"{state["version"]}-{audience}-{path_hash}"'
+
+
+def invalidate_menu(*establishment_ids):
+    """
+    Drop the menu state, cached menus of the old version are never read again
+    """
+    cache.delete_many(
+        [_state_key(establishment_id) for establishment_id in establishment_ids]
+    )
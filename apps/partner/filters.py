@@ -1,9 +1,10 @@
-from django.utils import timezone
 from django_filters import rest_framework as filters
 from django.contrib.gis.geos import Point
-from django.contrib.gis.db.models.functions import Distance
+from django.contrib.gis.measure import D
 
-from .models import Establishment
+from .geocache import nearby_establishment_ids
+from .models import Establishment, HappyHourSchedule
+from .utils import ArrayPosition, KNNDistance
 from ..beverage.models import Beverage
 
 
@@ -16,22 +17,43 @@ class EstablishmentFilter(filters.FilterSet):
         fields = []
 
     def filter_distance(self, queryset, name, value):
+        """
+        Keep establishments within `near_me` meters of the given coordinates,
+        nearest first so the `NEAR_ME_MAX_RESULTS` cap of the view keeps the
+        closest ones (`?ordering=distance` is implied).
+        Searches from the same geohash cell and radius bucket share cached
+        candidates and are resolved in process, see
+        `geocache.nearby_establishment_ids`. Others use `ST_DWithin` through
+        the GiST index on `location` and the KNN `<->` operator.
+        """
         latitude = self.request.query_params.get("latitude", None)
         longitude = self.request.query_params.get("longitude", None)
         if latitude and longitude and value:
             latitude = float(latitude)
             longitude = float(longitude)
             near_me = float(value)
+            nearest = nearby_establishment_ids(
+                longitude,
+                latitude,
+                near_me,
+                happyhours=bool(self.form.cleaned_data.get("happyhours_active")),
+            )
+            if nearest is not None:
+                return queryset.filter(id__in=nearest).order_by(
+                    ArrayPosition(nearest, "id")
+                )
+
             reference_location = Point(longitude, latitude, srid=4326)
-            queryset = queryset.annotate(
-                distance=Distance("location", reference_location)
-            ).filter(distance__lte=near_me)
+            queryset = queryset.filter(
+                location__dwithin=(reference_location, D(m=near_me))
+            ).order_by(KNNDistance("location", reference_location))
         return queryset
 
     def filter_happyhours_active(self, queryset, name, value):
-        now = timezone.localtime().time()
         if value:
-            return queryset.filter(happyhours_start__lte=now, happyhours_end__gte=now)
+            return queryset.filter(
+                id__in=HappyHourSchedule.objects.active_establishment_ids()
+            )
         return queryset
 
 
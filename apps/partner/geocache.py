@@ -0,0 +1,310 @@
+import math
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.gis.geos import Polygon
+from django.contrib.gis.measure import D
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Establishment, HappyHourSchedule
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+ENTRY_KEY = "geo:{cell}:{radius}:{happyhours}"
+VERSION_KEY = "geo:version:{cell}"
+STATS_KEY = "geo:stats:{field}"
+
+# WGS84 semi-major axis (meters) and first eccentricity squared
+WGS84_A = 6378137.0
+WGS84_E2 = 6.69437999014e-3
+
+
+def geohash_encode(longitude, latitude, precision):
+    """
+    Geohash of the cell containing the point
+    """
+    ranges = ([-180.0, 180.0], [-90.0, 90.0])
+    values = (longitude, latitude)
+    chars = []
+    bits = 0
+    for bit in range(precision * 5):
+        # bits alternate between longitude and latitude, longitude first
+        axis = bit % 2
+        low, high = ranges[axis]
+        middle = (low + high) / 2
+        if values[axis] >= middle:
+            bits = bits * 2 + 1
+            ranges[axis][0] = middle
+        else:
+            bits = bits * 2
+            ranges[axis][1] = middle
+        if bit % 5 == 4:
+            chars.append(BASE32[bits])
+            bits = 0
+    return "".join(chars)
+
+
+def geohash_bounds(geohash):
+    """
+    :return: (min_lon, min_lat, max_lon, max_lat) of the cell
+    """
+    ranges = ([-180.0, 180.0], [-90.0, 90.0])
+    bit = 0
+    for char in geohash:
+        index = BASE32.index(char)
+        for shift in range(4, -1, -1):
+            axis = bit % 2
+            middle = sum(ranges[axis]) / 2
+            ranges[axis][0 if (index >> shift) & 1 else 1] = middle
+            bit += 1
+    return ranges[0][0], ranges[1][0], ranges[0][1], ranges[1][1]
+
+
+def cell_size(precision):
+    """
+    :return: (width, height) in degrees of the cells of a precision
+    """
+    bits = precision * 5
+    return 360 / 2 ** math.ceil(bits / 2), 180 / 2 ** (bits // 2)
+
+
+def covering_cells(bbox, precision):
+    """
+    Geohashes of the cells of a precision intersecting the bounding box
+    """
+    min_lon, min_lat, max_lon, max_lat = bbox
+    min_lon, max_lon = max(min_lon, -180.0), min(max_lon, 180.0)
+    min_lat, max_lat = max(min_lat, -90.0), min(max_lat, 90.0)
+    width, height = cell_size(precision)
+    cells = set()
+    latitude = min_lat
+    while True:
+        longitude = min_lon
+        while True:
+            cells.add(geohash_encode(longitude, latitude, precision))
+            if longitude >= max_lon:
+                break
+            longitude = min(longitude + width, max_lon)
+        if latitude >= max_lat:
+            break
+        latitude = min(latitude + height, max_lat)
+    return cells
+
+
+def expand_bbox(bbox, meters):
+    """
+    Bounding box grown by `meters` on every side
+    """
+    min_lon, min_lat, max_lon, max_lat = bbox
+    lat_delta = meters / 110540
+    # a degree of longitude is shortest at the latitude furthest from the equator
+    furthest = min(max(abs(min_lat), abs(max_lat)) + lat_delta, 89.9)
+    lon_delta = meters / (111320 * math.cos(math.radians(furthest)))
+    return (
+        min_lon - lon_delta,
+        min_lat - lat_delta,
+        max_lon + lon_delta,
+        max_lat + lat_delta,
+    )
+
+
+def radius_bucket(radius):
+    """
+    Smallest configured radius the search fits in, None if it fits in none
+    """
+    for bucket in sorted(settings.GEO_CACHE_RADIUS_BUCKETS):
+        if radius <= bucket:
+            return bucket
+    return None
+
+
+def invalidate_location(*locations):
+    """
+    Start a new version of the cells containing the locations, entries
+    covering them are not read any more
+    """
+    for location in locations:
+        if location is None:
+            continue
+        cell = geohash_encode(
+            location.x, location.y, settings.GEO_CACHE_VERSION_PRECISION
+        )
+        cache.set(VERSION_KEY.format(cell=cell), uuid.uuid4().hex, timeout=None)
+
+
+class GeoCacheStats:
+    """
+    Hit and miss counts and microseconds spent, counted in process and added
+    to counters in the shared cache every `flush_interval` seconds
+    """
+
+    FIELDS = ("hits", "misses", "hit_us", "miss_us")
+
+    def __init__(self, flush_interval=None):
+        self.flush_interval = (
+            flush_interval
+            if flush_interval is not None
+            else settings.GEO_CACHE_STATS_FLUSH_INTERVAL
+        )
+        self._pending = Counter()
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, hit, seconds):
+        with self._lock:
+            self._pending["hits" if hit else "misses"] += 1
+            self._pending["hit_us" if hit else "miss_us"] += int(seconds * 1e6)
+            if time.monotonic() - self._flushed_at < self.flush_interval:
+                return
+            pending, self._pending = self._pending, Counter()
+            self._flushed_at = time.monotonic()
+        self._add(pending)
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._flushed_at = time.monotonic()
+        self._add(pending)
+
+    def _add(self, counts):
+        for field, value in counts.items():
+            if not value:
+                continue
+            key = STATS_KEY.format(field=field)
+            if not cache.add(key, value, timeout=None):
+                cache.incr(key, value)
+
+    def snapshot(self):
+        """
+        Totals of every process, including what this one has not flushed yet
+        """
+        keys = {field: STATS_KEY.format(field=field) for field in self.FIELDS}
+        shared = cache.get_many(keys.values())
+        with self._lock:
+            totals = {
+                field: shared.get(key, 0) + self._pending[field]
+                for field, key in keys.items()
+            }
+        lookups = totals["hits"] + totals["misses"]
+        return {
+            "hits": totals["hits"],
+            "misses": totals["misses"],
+            "hit_ratio": round(totals["hits"] / lookups, 4) if lookups else None,
+            "avg_hit_ms": (
+                round(totals["hit_us"] / totals["hits"] / 1000, 3)
+                if totals["hits"]
+                else None
+            ),
+            "avg_miss_ms": (
+                round(totals["miss_us"] / totals["misses"] / 1000, 3)
+                if totals["misses"]
+                else None
+            ),
+        }
+
+    def reset(self):
+        with self._lock:
+            self._pending.clear()
+        cache.delete_many([STATS_KEY.format(field=field) for field in self.FIELDS])
+
+
+geo_cache_stats = GeoCacheStats()
+
+
+def distance_meters(lon1, lat1, lon2, lat2):
+    """
+    Distance between two points on the WGS84 ellipsoid, using the radii of
+    curvature at their middle latitude. Within a centimeter of the PostGIS
+    geography distance for the radii searches are cached for
+    """
+    latitude = math.radians((lat1 + lat2) / 2)
+    w = math.sqrt(1 - WGS84_E2 * math.sin(latitude) ** 2)
+    meridian = WGS84_A * (1 - WGS84_E2) / w**3
+    prime_vertical = WGS84_A / w
+    dy = meridian * math.radians(lat2 - lat1)
+    dx = prime_vertical * math.cos(latitude) * math.radians(lon2 - lon1)
+    return math.hypot(dx, dy)
+
+
+def _nearby_candidates(cell, bucket, happyhours):
+    """
+    Establishments within `bucket` meters of any point of the cell, a
+    superset of the result of every search from the cell
+    :return: list of (id, longitude, latitude)
+    """
+    area = Polygon.from_bbox(geohash_bounds(cell))
+    area.srid = 4326
+    queryset = Establishment.objects.filter(location__dwithin=(area, D(m=bucket)))
+    if happyhours:
+        queryset = queryset.filter(
+            id__in=HappyHourSchedule.objects.active_establishment_ids()
+        )
+    rows = queryset.values_list("id", "location")[: settings.GEO_CACHE_MAX_IDS + 1]
+    return [(pk, location.x, location.y) for pk, location in rows]
+
+
+def _cached_candidates(cell, bucket, happyhours):
+    """
+    Candidates shared by every search from the same geohash cell and radius
+    bucket. An entry stores the versions of the cells its area covers and is
+    a miss once one of them changed
+    :return: (candidates or None if too many to cache, whether it was a hit)
+    """
+    key = ENTRY_KEY.format(cell=cell, radius=bucket, happyhours=int(happyhours))
+    entry = cache.get(key)
+    if entry is not None:
+        versions = cache.get_many(entry["versions"])
+        if all(versions.get(k) == v for k, v in entry["versions"].items()):
+            return entry["candidates"], True
+
+    area = expand_bbox(geohash_bounds(cell), bucket)
+    version_keys = [
+        VERSION_KEY.format(cell=covered)
+        for covered in covering_cells(area, settings.GEO_CACHE_VERSION_PRECISION)
+    ]
+    # versions are read before the query, a change during it makes a miss
+    versions = cache.get_many(version_keys)
+    candidates = _nearby_candidates(cell, bucket, happyhours)
+    if len(candidates) > settings.GEO_CACHE_MAX_IDS:
+        return None, False
+    timeout = settings.GEO_CACHE_TTL
+    if happyhours:
+        # happy hours start and end on whole minutes
+        timeout = min(timeout, 60 - timezone.localtime().second)
+    cache.set(
+        key,
+        {
+            "versions": {k: versions.get(k) for k in version_keys},
+            "candidates": candidates,
+        },
+        timeout,
+    )
+    return candidates, False
+
+
+def nearby_establishment_ids(longitude, latitude, radius, happyhours=False):
+    """
+    Ids of the establishments within `radius` meters of the point, nearest
+    first. Candidates come from the cache, the exact distance is checked here
+    so a hit makes no query. Stats time this whole path
+    :return: list of ids, or None if the search is not cached
+    """
+    bucket = radius_bucket(radius)
+    if bucket is None:
+        return None
+    start = time.perf_counter()
+    cell = geohash_encode(longitude, latitude, settings.GEO_CACHE_PRECISION)
+    candidates, hit = _cached_candidates(cell, bucket, happyhours)
+    ids = None
+    if candidates is not None:
+        nearby = []
+        for pk, x, y in candidates:
+            distance = distance_meters(longitude, latitude, x, y)
+            if distance <= radius:
+                nearby.append((distance, pk))
+        ids = [pk for distance, pk in sorted(nearby)]
+    geo_cache_stats.record(hit, time.perf_counter() - start)
+    return ids
@@ -0,0 +1,82 @@
+# Generated by Django 4.2 on 2026-10-18 10:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from apps.partner.utils import split_happyhours_window
+
+
+def build_schedules(apps, schema_editor):
+    Establishment = apps.get_model("partner", "Establishment")
+    HappyHourSchedule = apps.get_model("partner", "HappyHourSchedule")
+    establishments = Establishment.objects.filter(
+        happyhours_start__isnull=False, happyhours_end__isnull=False
+    ).values_list("id", "happyhours_start", "happyhours_end")
+    HappyHourSchedule.objects.bulk_create(
+        HappyHourSchedule(
+            establishment_id=establishment_id, weekday=weekday, start=start, end=end
+        )
+        for establishment_id, happyhours_start, happyhours_end in establishments
+        for day in range(7)
+        for weekday, start, end in split_happyhours_window(
+            day, happyhours_start, happyhours_end
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("partner", "0010_establishment_email"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HappyHourSchedule",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "weekday",
+                    models.PositiveSmallIntegerField(
+                        choices=[
+                            (0, "Monday"),
+                            (1, "Tuesday"),
+                            (2, "Wednesday"),
+                            (3, "Thursday"),
+                            (4, "Friday"),
+                            (5, "Saturday"),
+                            (6, "Sunday"),
+                        ]
+                    ),
+                ),
+                ("start", models.TimeField()),
+                ("end", models.TimeField()),
+                (
+                    "establishment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="happyhour_schedule",
+                        to="partner.establishment",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["weekday", "start"],
+                "indexes": [
+                    models.Index(
+                        fields=["weekday", "start", "end"],
+                        name="partner_hh_weekday_range_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(build_schedules, migrations.RunPython.noop),
+    ]
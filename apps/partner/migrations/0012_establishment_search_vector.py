@@ -0,0 +1,47 @@
+# Generated by Django 4.2 on 2026-10-18 19:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+from apps.partner.search import update_establishment_search_vectors
+
+
+def build_search_vectors(apps, schema_editor):
+    Establishment = apps.get_model("partner", "Establishment")
+    update_establishment_search_vectors(Establishment.objects.all())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("beverage", "0011_alter_beverage_price"),
+        ("partner", "0011_happyhourschedule"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="establishment",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="establishment",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="partner_estab_search_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="establishment",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"],
+                name="partner_estab_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.RunPython(build_search_vectors, migrations.RunPython.noop),
+    ]
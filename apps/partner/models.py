@@ -1,6 +1,11 @@
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.contrib.gis.db import models as geomodels
+from django.utils import timezone
+
+from .utils import split_happyhours_window
 
 User = get_user_model()
 
@@ -26,6 +31,138 @@ class Establishment(models.Model):
     happyhours_end = models.TimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True, null=True, blank=True)
     modified_at = models.DateTimeField(auto_now=True, null=True)
+    # maintained by signals, see `search.update_establishment_search_vectors`
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    loaded_location = None
+    loaded_happyhours = None
+    loaded_name = None
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="partner_estab_search_idx"),
+            GinIndex(
+                fields=["name"],
+                opclasses=["gin_trgm_ops"],
+                name="partner_estab_name_trgm_idx",
+            ),
+        ]
 
     def __str__(self):
         return "Establishment: " + self.name
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # location as loaded, the geo cache of the old place is invalidated too
+        instance.loaded_location = instance.__dict__.get("location")
+        # name as loaded, autocomplete results are only dropped when it changes
+        instance.loaded_name = instance.__dict__.get("name")
+        # happy hours as loaded, the schedule is only rebuilt when they change
+        if {"happyhours_start", "happyhours_end"}.issubset(field_names):
+            instance.loaded_happyhours = instance.get_happyhours()
+        return instance
+
+    def get_happyhours(self):
+        """
+        (start, end) of the daily happy hours as times, either may be None
+        """
+        return (
+            self._meta.get_field("happyhours_start").to_python(self.happyhours_start),
+            self._meta.get_field("happyhours_end").to_python(self.happyhours_end),
+        )
+
+    def happyhours_changed(self):
+        """
+        Whether the happy hours differ from the loaded ones, always true for
+        instances not loaded from the database
+        """
+        return self.loaded_happyhours != self.get_happyhours()
+
+    def get_happyhours_windows(self):
+        """
+        Daily happy hours windows as (weekday, start, end), one per weekday,
+        built from `happyhours_start` and `happyhours_end`.
+        """
+        start, end = self.get_happyhours()
+        if start is None or end is None:
+            return []
+        return [(weekday, start, end) for weekday in range(7)]
+
+    def is_happyhours_active(self, now=None):
+        """
+        Check if happy hours are active at `now` (local time), answered from
+        the schedule rows like the `happyhours_active` filter
+        """
+        return self.happyhour_schedule.active(now).exists()
+
+
+class HappyHourScheduleQuerySet(models.QuerySet):
+    def active(self, now=None):
+        """
+        Windows active at `now` (local time): a single range lookup on
+        the (weekday, start, end) index.
+        """
+        now = now or timezone.localtime()
+        current_time = now.time()
+        return self.filter(
+            weekday=now.weekday(), start__lte=current_time, end__gte=current_time
+        )
+
+    def active_establishment_ids(self, now=None):
+        return self.active(now).values("establishment_id")
+
+
+class HappyHourSchedule(models.Model):
+    """
+    Precomputed happy hours window of an establishment for one weekday.
+    A window crossing midnight is stored as two rows, the second one on the
+    following weekday, so every row satisfies start <= end.
+    """
+
+    WEEKDAY_CHOICES = (
+        (0, "Monday"),
+        (1, "Tuesday"),
+        (2, "Wednesday"),
+        (3, "Thursday"),
+        (4, "Friday"),
+        (5, "Saturday"),
+        (6, "Sunday"),
+    )
+
+    establishment = models.ForeignKey(
+        Establishment, on_delete=models.CASCADE, related_name="happyhour_schedule"
+    )
+    weekday = models.PositiveSmallIntegerField(choices=WEEKDAY_CHOICES)
+    start = models.TimeField()
+    end = models.TimeField()
+
+    objects = HappyHourScheduleQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["weekday", "start"]
+        indexes = [
+            models.Index(
+                fields=["weekday", "start", "end"], name="partner_hh_weekday_range_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_weekday_display()} {self.start}-{self.end}: {self.establishment_id}"
+
+    @classmethod
+    def rebuild_for(cls, establishment, windows=None):
+        """
+        Replace the schedule of an establishment.
+        :param establishment:
+        :param windows: iterable of (weekday, start, end), windows may cross
+        midnight. Defaults to the establishment's daily happy hours.
+        """
+        if windows is None:
+            windows = establishment.get_happyhours_windows()
+        cls.objects.filter(establishment=establishment).delete()
+        cls.objects.bulk_create(
+            cls(establishment=establishment, weekday=weekday, start=start, end=end)
+            for window in windows
+            for weekday, start, end in split_happyhours_window(*window)
+        )
@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Concat
+
+
+def _vector(expression, weight):
+    return SearchVector(expression, weight=weight, config=settings.SEARCH_CONFIG)
+
+
+def update_establishment_search_vectors(queryset):
+    """
+    Rebuild `search_vector` of the establishments in one UPDATE: name (A),
+    address (B), beverage and category names (C) and description (D).
+    Works with historical models, related models are taken from the queryset
+    """
+    Beverage = queryset.model._meta.get_field("beverages").related_model
+    beverage_names = (
+        Beverage.objects.filter(establishment=OuterRef("pk"))
+        .order_by()
+        .values("establishment")
+        .annotate(
+            names=StringAgg(Concat("name", Value(" "), "category__name"), " ")
+        )
+        .values("names")
+    )
+    queryset.update(
+        search_vector=_vector("name", "A")
+        + _vector("address", "B")
+        + _vector(Subquery(beverage_names), "C")
+        + _vector("description", "D")
+    )
+
+
+def update_beverage_search_vectors(queryset):
+    """
+    Rebuild `search_vector` of the beverages in one UPDATE: name (A),
+    category name (B), establishment name (C) and description (D)
+    """
+    Category = queryset.model._meta.get_field("category").related_model
+    Establishment = queryset.model._meta.get_field("establishment").related_model
+    category_name = Category.objects.filter(pk=OuterRef("category_id")).values("name")
+    establishment_name = Establishment.objects.filter(
+        pk=OuterRef("establishment_id")
+    ).values("name")
+    queryset.update(
+        search_vector=_vector("name", "A")
+        + _vector(Subquery(category_name[:1]), "B")
+        + _vector(Subquery(establishment_name[:1]), "C")
+        + _vector("description", "D")
+    )
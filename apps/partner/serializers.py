@@ -98,3 +98,62 @@ class EstablishmentCreateUpdateSerializer(BaseEstablishmentSerializer):
         phone_number_validation(validated_data)
         establishment = Establishment.objects.create(**validated_data)
         return establishment
+
+
+class AutocompleteQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(allow_blank=True, trim_whitespace=False)
+    limit = serializers.IntegerField(default=10, min_value=1, max_value=20)
+
+
+class AutocompleteItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    type = serializers.ChoiceField(choices=["establishment", "beverage", "category"])
+
+
+class ViewportQuerySerializer(serializers.Serializer):
+    bbox = serializers.CharField(help_text="min_lon,min_lat,max_lon,max_lat (WGS 84)")
+    zoom = serializers.IntegerField(min_value=0, max_value=22)
+
+    def validate_bbox(self, value):
+        try:
+            min_lon, min_lat, max_lon, max_lat = (
+                float(part) for part in value.split(",")
+            )
+        except ValueError:
+            raise serializers.ValidationError(
+                "Must be four numbers: min_lon,min_lat,max_lon,max_lat."
+            )
+        if not (-180 <= min_lon < max_lon <= 180 and -90 <= min_lat < max_lat <= 90):
+            raise serializers.ValidationError("Invalid bounding box.")
+        return min_lon, min_lat, max_lon, max_lat
+
+
+class ViewportClusterSerializer(serializers.Serializer):
+    count = serializers.IntegerField()
+    longitude = serializers.FloatField()
+    latitude = serializers.FloatField()
+    happyhours_active = serializers.IntegerField(
+        help_text="Establishments of the cluster in happy hours now"
+    )
+
+
+class ViewportEstablishmentSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    longitude = serializers.FloatField()
+    latitude = serializers.FloatField()
+    happyhours_active = serializers.BooleanField()
+
+
+class ViewportSerializer(serializers.Serializer):
+    clusters = ViewportClusterSerializer(many=True)
+    establishments = ViewportEstablishmentSerializer(many=True)
+
+
+class GeoCacheStatsSerializer(serializers.Serializer):
+    hits = serializers.IntegerField()
+    misses = serializers.IntegerField()
+    hit_ratio = serializers.FloatField(allow_null=True)
+    avg_hit_ms = serializers.FloatField(allow_null=True)
+    avg_miss_ms = serializers.FloatField(allow_null=True)
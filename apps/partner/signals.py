@@ -0,0 +1,158 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .autocomplete import invalidate_autocomplete
+from .cache import invalidate_menu
+from .geocache import invalidate_location
+from .models import Establishment, HappyHourSchedule
+from .search import update_beverage_search_vectors, update_establishment_search_vectors
+from ..beverage.models import Beverage, Category
+
+
+@receiver(post_save, sender=Establishment)
+def rebuild_happyhour_schedule(sender, instance, update_fields=None, **kwargs):
+    """
+    Keep the precomputed schedule in sync with the establishment's happy hours.
+    Only rebuilt when they change, windows set with `rebuild_for` survive
+    other edits
+    """
+    if update_fields is None:
+        if not instance.happyhours_changed():
+            return
+    elif not {"happyhours_start", "happyhours_end"}.intersection(update_fields):
+        return
+    HappyHourSchedule.rebuild_for(instance)
+    instance.loaded_happyhours = instance.get_happyhours()
+
+
+@receiver(post_save, sender=Establishment)
+@receiver(post_delete, sender=Establishment)
+def invalidate_establishment_menu(sender, instance, **kwargs):
+    establishment_id = instance.id
+    transaction.on_commit(lambda: invalidate_menu(establishment_id))
+
+
+@receiver(post_save, sender=Beverage)
+@receiver(post_delete, sender=Beverage)
+def invalidate_beverage_menu(sender, instance, **kwargs):
+    establishment_id = instance.establishment_id
+    transaction.on_commit(lambda: invalidate_menu(establishment_id))
+
+
+@receiver(post_save, sender=Category)
+def invalidate_category_menus(sender, instance, created=False, **kwargs):
+    if created:
+        return
+    establishment_ids = list(
+        Beverage.objects.filter(category=instance)
+        .values_list("establishment_id", flat=True)
+        .distinct()
+    )
+    transaction.on_commit(lambda: invalidate_menu(*establishment_ids))
+
+
+@receiver(post_save, sender=Establishment)
+def update_establishment_search(sender, instance, update_fields=None, **kwargs):
+    """
+    Beverages are searchable by the establishment name, rebuild theirs too
+    """
+    if update_fields is not None and not {
+        "name",
+        "address",
+        "description",
+    }.intersection(update_fields):
+        return
+    update_establishment_search_vectors(Establishment.objects.filter(id=instance.id))
+    if update_fields is None or "name" in update_fields:
+        update_beverage_search_vectors(
+            Beverage.objects.filter(establishment_id=instance.id)
+        )
+
+
+@receiver(post_save, sender=Beverage)
+def update_beverage_search(sender, instance, **kwargs):
+    update_beverage_search_vectors(Beverage.objects.filter(id=instance.id))
+    update_establishment_search_vectors(
+        Establishment.objects.filter(id=instance.establishment_id)
+    )
+
+
+@receiver(post_delete, sender=Beverage)
+def update_deleted_beverage_search(sender, instance, **kwargs):
+    update_establishment_search_vectors(
+        Establishment.objects.filter(id=instance.establishment_id)
+    )
+
+
+@receiver(post_save, sender=Category)
+def update_category_search(sender, instance, created=False, **kwargs):
+    if created:
+        return
+    beverages = Beverage.objects.filter(category=instance)
+    update_beverage_search_vectors(beverages)
+    update_establishment_search_vectors(
+        Establishment.objects.filter(
+            id__in=beverages.values("establishment_id")
+        )
+    )
+
+
+# fields autocomplete results are built from, other edits keep them cached
+AUTOCOMPLETE_FIELDS = {
+    Establishment: ("name",),
+    Beverage: ("name", "availability_status"),
+    Category: ("name",),
+}
+
+
+@receiver(post_save, sender=Establishment)
+@receiver(post_save, sender=Beverage)
+@receiver(post_save, sender=Category)
+def invalidate_autocomplete_results(
+    sender, instance, created=False, update_fields=None, **kwargs
+):
+    """
+    Compared with the values the instance was loaded with (see `from_db`)
+    """
+    fields = AUTOCOMPLETE_FIELDS[sender]
+    if update_fields is not None:
+        fields = [field for field in fields if field in update_fields]
+    changed = [
+        field
+        for field in fields
+        if getattr(instance, field) != getattr(instance, f"loaded_{field}")
+    ]
+    for field in fields:
+        setattr(instance, f"loaded_{field}", getattr(instance, field))
+    if created or changed:
+        transaction.on_commit(invalidate_autocomplete)
+
+
+@receiver(post_delete, sender=Establishment)
+@receiver(post_delete, sender=Beverage)
+@receiver(post_delete, sender=Category)
+def invalidate_deleted_autocomplete_results(sender, **kwargs):
+    transaction.on_commit(invalidate_autocomplete)
+
+
+@receiver(post_save, sender=Establishment)
+def invalidate_establishment_geo_cache(sender, instance, **kwargs):
+    """
+    Saving may move the establishment or change its happy hours, the cells
+    of its location and, if it moved, of its old location are invalidated
+    """
+    locations = [instance.location]
+    if instance.loaded_location is not None and (
+        instance.location is None
+        or not instance.loaded_location.equals_exact(instance.location)
+    ):
+        locations.append(instance.loaded_location)
+    instance.loaded_location = instance.location
+    transaction.on_commit(lambda: invalidate_location(*locations))
+
+
+@receiver(post_delete, sender=Establishment)
+def invalidate_deleted_establishment_geo_cache(sender, instance, **kwargs):
+    location = instance.location
+    transaction.on_commit(lambda: invalidate_location(location))
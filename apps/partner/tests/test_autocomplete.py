@@ -0,0 +1,92 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.beverage.models import Beverage
+from happyhours.factories import (
+    BeverageFactory,
+    CategoryFactory,
+    EstablishmentFactory,
+    OrderFactory,
+    UserFactory,
+)
+from ..autocomplete import autocomplete_cache, get_generation
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    cache.clear()
+    autocomplete_cache.clear()
+
+
+@pytest.mark.django_db
+class TestAutocompleteView:
+    def setup_method(self):
+        self.client = APIClient()
+        self.client.force_authenticate(UserFactory(role="client"))
+        self.url = reverse("v1:autocomplete")
+
+    def suggest(self, q, **params):
+        response = self.client.get(self.url, {"q": q, **params})
+        assert response.status_code == status.HTTP_200_OK
+        return [(item["type"], item["name"]) for item in response.data]
+
+    def test_types_and_word_prefixes(self):
+        category = CategoryFactory(name="Margaritas")
+        EstablishmentFactory(name="Casa Margarita")
+        BeverageFactory(name="Margarita", category=category, availability_status=True)
+        BeverageFactory(name="Mars Ale", availability_status=False)
+        EstablishmentFactory(name="Pub")
+
+        assert sorted(self.suggest("MARG")) == [
+            ("beverage", "Margarita"),
+            ("category", "Margaritas"),
+            ("establishment", "Casa Margarita"),
+        ]
+
+    def test_most_ordered_first(self):
+        quiet = BeverageFactory(name="Mojito Classic", availability_status=True)
+        popular = BeverageFactory(name="Mojito Mango", availability_status=True)
+        for _ in range(2):
+            OrderFactory(beverage=popular, establishment=popular.establishment)
+        OrderFactory(beverage=quiet, establishment=quiet.establishment)
+
+        assert self.suggest("moj", limit=2) == [
+            ("beverage", "Mojito Mango"),
+            ("beverage", "Mojito Classic"),
+        ]
+
+    def test_cached_until_names_change(
+        self, django_assert_num_queries, django_capture_on_commit_callbacks
+    ):
+        establishment = EstablishmentFactory(name="Tap Room")
+        assert self.suggest("tap") == [("establishment", "Tap Room")]
+
+        with django_assert_num_queries(0):
+            assert self.suggest("Tap ") == [("establishment", "Tap Room")]
+
+        establishment.name = "Taproom"
+        with django_capture_on_commit_callbacks(execute=True):
+            establishment.save()
+        assert self.suggest("tap") == [("establishment", "Taproom")]
+
+    def test_only_shown_fields_invalidate(self, django_capture_on_commit_callbacks):
+        beverage = BeverageFactory(name="Negroni", availability_status=True)
+        beverage = Beverage.objects.get(id=beverage.id)
+        generation = get_generation()
+
+        beverage.price = 9
+        with django_capture_on_commit_callbacks(execute=True):
+            beverage.save()
+        assert get_generation() == generation
+
+        beverage.availability_status = False
+        with django_capture_on_commit_callbacks(execute=True):
+            beverage.save()
+        assert get_generation() != generation
+
+    def test_blank_query(self, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            assert self.suggest("  ") == []
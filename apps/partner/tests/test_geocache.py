@@ -0,0 +1,121 @@
+import pytest
+from django.contrib.gis.geos import Point
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from happyhours.factories import EstablishmentFactory, UserFactory
+from ..geocache import (
+    covering_cells,
+    distance_meters,
+    geo_cache_stats,
+    geohash_bounds,
+    geohash_encode,
+    nearby_establishment_ids,
+)
+
+CENTER = (74.6122, 42.8746)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    cache.clear()
+    geo_cache_stats.reset()
+
+
+def test_geohash():
+    assert geohash_encode(-5.6, 42.6, 5) == "ezs42"
+    min_lon, min_lat, max_lon, max_lat = geohash_bounds("ezs42")
+    assert min_lon <= -5.6 <= max_lon and min_lat <= 42.6 <= max_lat
+    assert covering_cells((min_lon, min_lat, max_lon, max_lat), 5) == {"ezs42"}
+
+
+def test_distance_meters():
+    # geodesic distances on WGS84
+    assert distance_meters(74.6122, 42.8746, 74.7, 42.93) == pytest.approx(
+        9449.600, abs=0.01
+    )
+    assert distance_meters(10, 60, 10.15, 60.05) == pytest.approx(10049.036, abs=0.01)
+
+
+@pytest.mark.django_db
+class TestNearMeCache:
+    def setup_method(self):
+        self.client = APIClient()
+        self.client.force_authenticate(UserFactory(role="client"))
+        self.url = reverse("v1:establishments")
+        self.establishment = EstablishmentFactory(
+            location=Point(CENTER[0] + 0.001, CENTER[1], srid=4326)
+        )
+
+    def search(self, longitude=CENTER[0], latitude=CENTER[1], near_me=1000):
+        response = self.client.get(
+            self.url,
+            {"near_me": near_me, "longitude": longitude, "latitude": latitude},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        return {establishment["id"] for establishment in response.data}
+
+    def test_same_cell_is_a_hit(self):
+        assert self.search() == {self.establishment.id}
+        # a few meters away, same cell and radius bucket
+        assert self.search(CENTER[0] + 0.0001) == {self.establishment.id}
+
+        stats = geo_cache_stats.snapshot()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+        assert stats["hit_ratio"] == 0.5
+
+    def test_hit_makes_no_query(self, django_assert_num_queries):
+        nearby_establishment_ids(*CENTER, 1000)
+
+        with django_assert_num_queries(0):
+            assert nearby_establishment_ids(*CENTER, 1000) == [self.establishment.id]
+
+    def test_nearest_first(self):
+        nearest = EstablishmentFactory(location=Point(*CENTER, srid=4326))
+        response = self.client.get(
+            self.url,
+            {
+                "near_me": 1000,
+                "longitude": CENTER[0],
+                "latitude": CENTER[1],
+                "ordering": "distance",
+            },
+        )
+        assert [e["id"] for e in response.data] == [nearest.id, self.establishment.id]
+
+    def test_distance_still_exact(self):
+        assert self.search(near_me=100) == {self.establishment.id}
+
+        # same cell, the cached candidates are checked against the radius
+        assert self.search(CENTER[0] - 0.003, near_me=100) == set()
+        assert geo_cache_stats.snapshot()["hits"] == 1
+
+    def test_created_establishment_invalidates(
+        self, django_capture_on_commit_callbacks
+    ):
+        self.search()
+        with django_capture_on_commit_callbacks(execute=True):
+            created = EstablishmentFactory(location=Point(*CENTER, srid=4326))
+
+        assert self.search() == {self.establishment.id, created.id}
+
+    def test_moved_establishment_invalidates(
+        self, django_capture_on_commit_callbacks
+    ):
+        self.search()
+        self.establishment.location = Point(10, 20, srid=4326)
+        with django_capture_on_commit_callbacks(execute=True):
+            self.establishment.save()
+
+        assert self.search() == set()
+
+    def test_stats_for_admins(self):
+        self.search()
+        self.client.force_authenticate(UserFactory(role="admin"))
+
+        response = self.client.get(reverse("v1:geo-cache-stats"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["misses"] == 1
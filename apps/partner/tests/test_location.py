@@ -1,5 +1,6 @@
 import pytest
 from django.contrib.gis.geos import Point
+from django.test import override_settings
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
@@ -78,8 +79,46 @@ class TestEstablishmentLocationView:
         self.client.force_authenticate(self.user)
         response = self.client.get(self.url, params)
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 1
-        assert response.data[0]["id"] == self.establishment1.id
+        assert [item["id"] for item in response.data] == [self.establishment1.id]
+
+    def test_filter_by_distance_ordering(self):
+        nearer = EstablishmentFactory(
+            location=Point(74.6166, 42.8246, srid=4326),
+        )
+        params = {
+            "latitude": "42.8246",
+            "longitude": "74.6166",
+            "near_me": "50000",
+            "ordering": "distance",
+        }
+        self.client.force_authenticate(self.user)
+        response = self.client.get(self.url, params)
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["id"] for item in response.data] == [
+            nearer.id,
+            self.establishment1.id,
+        ]
+
+        # nearest first without asking for it too
+        del params["ordering"]
+        response = self.client.get(self.url, params)
+        assert [item["id"] for item in response.data] == [
+            nearer.id,
+            self.establishment1.id,
+        ]
+
+    @override_settings(NEAR_ME_MAX_RESULTS=1)
+    def test_filter_by_distance_result_cap(self):
+        nearest = EstablishmentFactory(location=Point(74.6166, 42.8246, srid=4326))
+        params = {
+            "latitude": "42.8246",
+            "longitude": "74.6166",
+            "near_me": "50000",
+        }
+        self.client.force_authenticate(self.user)
+        response = self.client.get(self.url, params)
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["id"] for item in response.data] == [nearest.id]
 
     def test_filter_happyhours_active(self):
         current_time = timezone.now().replace(hour=10, minute=0)
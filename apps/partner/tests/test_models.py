@@ -1,7 +1,10 @@
+import datetime
+
 import pytest
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from happyhours.factories import EstablishmentFactory
-from ..models import Establishment
+from ..models import Establishment, HappyHourSchedule
 
 User = get_user_model()
 
@@ -20,3 +23,67 @@ class TestEstablishmentModel:
         establishment.save()
         updated = Establishment.objects.get(id=establishment.id)
         assert updated.name == "Updated Name"
+
+
+@pytest.mark.django_db
+class TestHappyHourSchedule:
+    @staticmethod
+    def local(weekday, hour):
+        # 2024-05-06 is a Monday
+        day = datetime.date(2024, 5, 6) + datetime.timedelta(days=weekday)
+        return timezone.make_aware(datetime.datetime.combine(day, datetime.time(hour)))
+
+    def test_schedule_built_on_save(self):
+        establishment = EstablishmentFactory(
+            happyhours_start="15:00:00", happyhours_end="17:00:00"
+        )
+        assert establishment.happyhour_schedule.count() == 7
+
+        establishment.happyhours_start = None
+        establishment.save()
+        assert not establishment.happyhour_schedule.exists()
+
+    def test_overnight_window(self):
+        establishment = EstablishmentFactory(
+            happyhours_start="22:00:00", happyhours_end="02:00:00"
+        )
+        assert establishment.happyhour_schedule.count() == 14
+
+        tuesday_night = self.local(1, 1)
+        active_ids = HappyHourSchedule.objects.active_establishment_ids(tuesday_night)
+        assert list(active_ids) == [{"establishment_id": establishment.id}]
+        assert establishment.is_happyhours_active(tuesday_night)
+        assert establishment.is_happyhours_active(self.local(1, 23))
+        assert not establishment.is_happyhours_active(self.local(1, 3))
+        assert not HappyHourSchedule.objects.active(self.local(1, 3)).exists()
+
+    def test_custom_weekday_windows(self):
+        establishment = EstablishmentFactory()
+        HappyHourSchedule.rebuild_for(
+            establishment,
+            [
+                (4, datetime.time(12), datetime.time(14)),
+                (4, datetime.time(18), datetime.time(20)),
+            ],
+        )
+        assert HappyHourSchedule.objects.active(self.local(4, 19)).exists()
+        assert establishment.is_happyhours_active(self.local(4, 19))
+        assert not HappyHourSchedule.objects.active(self.local(4, 16)).exists()
+        assert not HappyHourSchedule.objects.active(self.local(3, 19)).exists()
+
+    def test_custom_windows_kept_on_other_edits(self):
+        establishment = EstablishmentFactory(
+            happyhours_start="15:00:00", happyhours_end="17:00:00"
+        )
+        establishment = Establishment.objects.get(id=establishment.id)
+        HappyHourSchedule.rebuild_for(
+            establishment, [(4, datetime.time(18), datetime.time(20))]
+        )
+
+        establishment.name = "Renamed"
+        establishment.save()
+        assert establishment.happyhour_schedule.count() == 1
+
+        establishment.happyhours_end = "18:00:00"
+        establishment.save()
+        assert establishment.happyhour_schedule.count() == 7
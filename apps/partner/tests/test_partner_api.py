@@ -175,3 +175,37 @@ class TestEstablishmentAPI:
             "No beverages found for this establishment or establishment does not exist."
             in response.data["detail"]
         )
+
+    def test_menu_revalidation_not_modified(self):
+        user = UserFactory()
+        establishment = EstablishmentFactory()
+        BeverageFactory(establishment=establishment, availability_status=True)
+
+        self.client.force_authenticate(user=user)
+        url = reverse("v1:menu-list", kwargs={"pk": establishment.pk})
+        response = self.client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        etag = response["ETag"]
+        assert not response.has_header("Last-Modified")
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_menu_cache_invalidated_on_beverage_change(
+        self, django_capture_on_commit_callbacks
+    ):
+        user = UserFactory()
+        establishment = EstablishmentFactory()
+        beverage = BeverageFactory(establishment=establishment, availability_status=True)
+
+        self.client.force_authenticate(user=user)
+        url = reverse("v1:menu-list", kwargs={"pk": establishment.pk})
+        etag = self.client.get(url)["ETag"]
+
+        beverage.name = "Renamed"
+        with django_capture_on_commit_callbacks(execute=True):
+            beverage.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+        assert response.data[0]["name"] == "Renamed"
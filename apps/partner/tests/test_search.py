@@ -0,0 +1,70 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from happyhours.factories import (
+    BeverageFactory,
+    CategoryFactory,
+    EstablishmentFactory,
+    UserFactory,
+)
+
+
+@pytest.mark.django_db
+class TestEstablishmentSearch:
+    def setup_method(self):
+        self.client = APIClient()
+        self.client.force_authenticate(UserFactory(role="client"))
+        self.url = reverse("v1:establishments")
+
+    def search(self, text):
+        response = self.client.get(self.url, {"search": text})
+        assert response.status_code == status.HTTP_200_OK
+        return [establishment["name"] for establishment in response.data]
+
+    def test_matching_beverages_do_not_duplicate(self):
+        establishment = EstablishmentFactory(name="Harbour Pub")
+        BeverageFactory.create_batch(3, establishment=establishment, name="Mojito")
+        EstablishmentFactory(name="Other Place")
+
+        assert self.search("mojito") == ["Harbour Pub"]
+
+    def test_prefix_and_typo(self):
+        EstablishmentFactory(name="Sunset Lounge")
+
+        assert self.search("suns") == ["Sunset Lounge"]
+        assert self.search("sunsett") == ["Sunset Lounge"]
+
+    def test_name_ranked_above_description(self):
+        EstablishmentFactory(name="Quiet Corner", description="Best negroni in town")
+        EstablishmentFactory(name="Negroni Bar", description="Cocktails")
+
+        assert self.search("negroni") == ["Negroni Bar", "Quiet Corner"]
+
+    def test_vector_follows_category_rename(self):
+        category = CategoryFactory(name="Lager")
+        establishment = EstablishmentFactory(name="Tap Room")
+        BeverageFactory(establishment=establishment, category=category)
+
+        category.name = "Stout"
+        category.save()
+
+        assert self.search("stout") == ["Tap Room"]
+        assert self.search("lager") == []
+
+
+@pytest.mark.django_db
+def test_beverage_search_by_establishment_name():
+    client = APIClient()
+    client.force_authenticate(UserFactory(role="client"))
+    establishment = EstablishmentFactory(name="Harbour Pub")
+    beverage = BeverageFactory(establishment=establishment)
+    BeverageFactory()
+
+    establishment.name = "Riverside Pub"
+    establishment.save()
+
+    response = client.get(reverse("v1:beverage-list"), {"search": "riverside"})
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in response.data] == [beverage.id]
@@ -0,0 +1,74 @@
+import datetime
+
+import pytest
+import pytz
+from django.contrib.gis.geos import Point
+from django.urls import reverse
+from freezegun import freeze_time
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from happyhours.factories import EstablishmentFactory, UserFactory
+
+BBOX = "74.5,42.8,74.7,42.9"
+
+
+@pytest.mark.django_db
+class TestMapViewportView:
+    def setup_method(self):
+        self.client = APIClient()
+        self.client.force_authenticate(UserFactory(role="client"))
+        self.url = reverse("v1:map-viewport")
+        self.near = [
+            EstablishmentFactory(
+                location=Point(74.6101, 42.8701, srid=4326),
+                happyhours_start="15:00:00",
+                happyhours_end="18:00:00",
+            ),
+            EstablishmentFactory(
+                location=Point(74.6102, 42.8702, srid=4326),
+                happyhours_start="20:00:00",
+                happyhours_end="23:00:00",
+            ),
+        ]
+        self.far = EstablishmentFactory(location=Point(74.69, 42.89, srid=4326))
+        EstablishmentFactory(location=Point(10, 20, srid=4326))
+
+    def get(self, **params):
+        response = self.client.get(self.url, params)
+        assert response.status_code == status.HTTP_200_OK
+        return response.data
+
+    @freeze_time(
+        pytz.timezone("Asia/Bishkek")
+        .localize(datetime.datetime(2023, 5, 1, 16, 0))
+        .astimezone(pytz.utc)
+    )
+    def test_zoomed_out_clusters(self, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            data = self.get(bbox=BBOX, zoom=12)
+
+        assert [(c["count"], c["happyhours_active"]) for c in data["clusters"]] == [
+            (2, 1)
+        ]
+        assert [e["id"] for e in data["establishments"]] == [self.far.id]
+
+    def test_zoomed_in_establishments(self):
+        data = self.get(bbox="74.609,42.869,74.611,42.871", zoom=20)
+
+        assert data["clusters"] == []
+        assert sorted(e["id"] for e in data["establishments"]) == sorted(
+            establishment.id for establishment in self.near
+        )
+        assert set(data["establishments"][0]) == {
+            "id",
+            "name",
+            "longitude",
+            "latitude",
+            "happyhours_active",
+        }
+
+    def test_invalid_bbox(self):
+        response = self.client.get(self.url, {"bbox": "74.7,42.8,74.5", "zoom": 12})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -1,8 +1,11 @@
 from django.urls import path
 
 from .views import (
+    AutocompleteView,
     EstablishmentListCreateView,
     EstablishmentViewSet,
+    GeoCacheStatsView,
+    MapViewportView,
     MenuView,
 )
 
@@ -25,4 +28,7 @@ urlpatterns = [
         name="establishment-detail",
     ),
     path("menu/<int:pk>/", MenuView.as_view({"get": "list"}), name="menu-list"),
+    path("autocomplete/", AutocompleteView.as_view(), name="autocomplete"),
+    path("map/", MapViewportView.as_view(), name="map-viewport"),
+    path("geo-cache/stats/", GeoCacheStatsView.as_view(), name="geo-cache-stats"),
 ]
@@ -1,7 +1,11 @@
+import datetime
 import re
 from io import BytesIO
 import qrcode
 
+from django.contrib.gis.db.models import PointField
+from django.contrib.postgres.fields import ArrayField
+from django.db.models import BigIntegerField, FloatField, Func, IntegerField, Value
 from rest_framework.exceptions import ValidationError
 
 
@@ -15,3 +19,49 @@ def phone_number_validation(validated_data):
     if "phone_number" in validated_data:
         if not re.match(phone_pattern, validated_data["phone_number"]):
             raise ValidationError("Invalid phone number. Must be kgz national format")
+
+
+def split_happyhours_window(weekday, start, end):
+    """
+    Split a happy hours window into segments that do not cross midnight
+    :param weekday: 0 (Monday) - 6 (Sunday), the day the window starts
+    :param start:
+    :param end:
+    :return: list of (weekday, start, end)
+    """
+    if start <= end:
+        return [(weekday, start, end)]
+    return [
+        (weekday, start, datetime.time.max),
+        ((weekday + 1) % 7, datetime.time.min, end),
+    ]
+
+
+class KNNDistance(Func):
+    """
+    PostGIS `<->` operator between a geography column and a point.
+    Used in ORDER BY it lets the planner walk the GiST index nearest-first
+    instead of computing the distance to every row.
+    """
+
+    arg_joiner = " <-> "
+    template = "%(expressions)s"
+    output_field = FloatField()
+
+    def __init__(self, expression, point, **extra):
+        point = Value(point, output_field=PointField(geography=True))
+        super().__init__(expression, point, **extra)
+
+
+class ArrayPosition(Func):
+    """
+    Position of the column value in a list of values, to keep the order of
+    ids sorted outside the database
+    """
+
+    function = "array_position"
+    output_field = IntegerField()
+
+    def __init__(self, values, expression, **extra):
+        values = Value(list(values), output_field=ArrayField(BigIntegerField()))
+        super().__init__(values, expression, **extra)
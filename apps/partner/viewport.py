@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.db import connection
+
+from .models import Establishment, HappyHourSchedule
+
+CLUSTER_SQL = """
+SELECT
+    count(*),
+    avg(ST_X(e.location::geometry)),
+    avg(ST_Y(e.location::geometry)),
+    min(e.id),
+    min(e.name),
+    count(*) FILTER (WHERE e.id IN ({active}))
+FROM {table} e
+WHERE e.location && ST_MakeEnvelope(%s, %s, %s, %s, 4326)::geography
+GROUP BY ST_SnapToGrid(e.location::geometry, %s)
+ORDER BY count(*) DESC
+"""
+
+
+def grid_size(bbox, zoom):
+    """
+    Cell size in degrees: a fraction of a map tile at `zoom`, but never so
+    small that the bounding box has more than MAP_MAX_GRID cells a side
+    """
+    min_lon, min_lat, max_lon, max_lat = bbox
+    tile = 360 / 2**zoom
+    return max(
+        tile / settings.MAP_CELLS_PER_TILE,
+        max(max_lon - min_lon, max_lat - min_lat) / settings.MAP_MAX_GRID,
+    )
+
+
+def cluster_establishments(bbox, zoom, now=None):
+    """
+    Establishments inside the bounding box grouped on a grid with
+    ST_SnapToGrid, in one query using the GiST index on `location`
+    :param bbox: (min_lon, min_lat, max_lon, max_lat)
+    :param zoom: map zoom level
+    :param now: local time the happy hours are checked at
+    :return: dict with `clusters` (cells with more than one establishment)
+    and `establishments` (alone in their cell)
+    """
+    active_sql, active_params = (
+        HappyHourSchedule.objects.active_establishment_ids(now)
+        .order_by()
+        .query.sql_with_params()
+    )
+    sql = CLUSTER_SQL.format(
+        active=active_sql,
+        table=connection.ops.quote_name(Establishment._meta.db_table),
+    )
+    params = (*active_params, *bbox, grid_size(bbox, zoom))
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    clusters = []
+    establishments = []
+    for count, longitude, latitude, establishment_id, name, active in rows:
+        if count == 1:
+            establishments.append(
+                {
+                    "id": establishment_id,
+                    "name": name,
+                    "longitude": longitude,
+                    "latitude": latitude,
+                    "happyhours_active": bool(active),
+                }
+            )
+        else:
+            clusters.append(
+                {
+                    "count": count,
+                    "longitude": longitude,
+                    "latitude": latitude,
+                    "happyhours_active": active,
+                }
+            )
+    return {"clusters": clusters, "establishments": establishments}
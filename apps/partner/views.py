@@ -1,8 +1,9 @@
+from django.conf import settings
+from django.utils.cache import get_conditional_response
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema
 from rest_framework import viewsets
 from rest_framework.exceptions import PermissionDenied, NotFound
-from rest_framework.filters import SearchFilter
 from rest_framework.generics import (
     ListAPIView,
     CreateAPIView,
@@ -13,19 +14,31 @@ from rest_framework.generics import (
 )
 
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.viewsets import ViewSetMixin
 from happyhours.permissions import (
     IsAdmin,
     IsPartnerOwner,
     IsPartnerUser,
 )
+from happyhours.search import RankedSearchFilter
+from .autocomplete import autocomplete
+from .cache import get_menu, get_menu_etag, get_menu_state
 from .filters import EstablishmentFilter, MenuFilter
+from .geocache import geo_cache_stats
 from .serializers import (
+    AutocompleteItemSerializer,
+    AutocompleteQuerySerializer,
     EstablishmentSerializer,
+    GeoCacheStatsSerializer,
     EstablishmentCreateUpdateSerializer,
+    ViewportQuerySerializer,
+    ViewportSerializer,
     # MenuSerializer,
 )
 from .models import Establishment
+from .viewport import cluster_establishments
 from ..beverage.models import Beverage
 from ..beverage.serializers import BeverageSerializer
 
@@ -42,6 +55,12 @@ class EstablishmentListCreateView(ListCreateAPIView):
     ensuring that users receive data that is relevant and appropriate to their permissions.
     - Ensures that the partner has not exceeded their limit of owned establishments.
     - Checks data integrity for phone numbers and locations during creation.
+    - `near_me` (meters, with `latitude`/`longitude`) is an index-assisted radius
+    search returning the nearest first. Radius searches are capped at the
+    `NEAR_ME_MAX_RESULTS` nearest establishments.
+    - `search` matches words, or word prefixes, of the name, address,
+    description and beverage and category names, best matches first.
+    Misspelled names are matched by trigram similarity.
     """
 
     def get_serializer_class(self):
@@ -49,9 +68,9 @@ class EstablishmentListCreateView(ListCreateAPIView):
             return EstablishmentCreateUpdateSerializer
         return EstablishmentSerializer
 
-    filter_backends = [DjangoFilterBackend, SearchFilter]
+    filter_backends = [DjangoFilterBackend, RankedSearchFilter]
     filterset_class = EstablishmentFilter
-    search_fields = ["name", "beverages__name"]
+    search_trigram_fields = ["name"]
 
     def get_queryset(self):
         user = self.request.user
@@ -59,6 +78,12 @@ class EstablishmentListCreateView(ListCreateAPIView):
             return Establishment.objects.filter(owner=user)
         return Establishment.objects.all()
 
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.query_params.get("near_me"):
+            queryset = queryset[: settings.NEAR_ME_MAX_RESULTS]
+        return queryset
+
     def get_permissions(self):
         if self.request.method == 'POST':
             return [IsPartnerUser()]
@@ -105,6 +130,13 @@ class MenuView(viewsets.ReadOnlyModelViewSet):
     """
     Provides a view of the menu for a specific establishment,
     accessible to all authenticated users.
+
+    ### Implementation Details:
+    - Serialized menus are cached per establishment, owner/public view and
+    category filter. Cache is invalidated when a beverage, category or the
+    establishment changes.
+    - Responses carry an `ETag`, clients can revalidate with `If-None-Match`
+    and get `304 Not Modified`.
     """
 
     serializer_class = BeverageSerializer
@@ -127,8 +159,113 @@ class MenuView(viewsets.ReadOnlyModelViewSet):
         ).select_related("category", "establishment")
 
     def list(self, request, *args, **kwargs):
-        if not self.get_queryset().exists():
+        establishment_id = self.kwargs.get("pk")
+        state = get_menu_state(establishment_id)
+        if state is None:
+            raise NotFound(
+                "No beverages found for this establishment or establishment does not exist."
+            )
+        is_owner = state["owner_id"] is not None and state["owner_id"] == request.user.id
+        etag = get_menu_etag(state, is_owner, request.get_full_path())
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "private, no-cache",
+        }
+
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            for header, value in headers.items():
+                not_modified[header] = value
+            return not_modified
+
+        menu = get_menu(
+            establishment_id, state, is_owner, request.query_params.get("category", "")
+        )
+        if not menu:
             raise NotFound(
                 "No beverages found for this establishment or establishment does not exist."
             )
-        return super().list(request, *args, **kwargs)
+        page = self.paginate_queryset(menu)
+        if page is not None:
+            response = self.get_paginated_response(page)
+        else:
+            response = Response(menu)
+        for header, value in headers.items():
+            response[header] = value
+        return response
+
+
+@extend_schema(
+    tags=["Establishments"],
+    parameters=[AutocompleteQuerySerializer],
+    responses=AutocompleteItemSerializer(many=True),
+)
+class AutocompleteView(APIView):
+    """
+    Search box suggestions: ids, names and types of establishments, available
+    beverages and categories whose name, or a word of it, starts with `q`.
+    The most ordered in the last `AUTOCOMPLETE_POPULARITY_DAYS` come first.
+
+    ### Implementation Details:
+    - Prefixes are matched through the trigram indexes on `name`, popularity
+    is read from the order rollups.
+    - Results are kept per prefix in a bounded in-process LRU cache. Any
+    change to an establishment, beverage or category starts a new cache
+    generation, shared by all processes through the cache backend.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = AutocompleteQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        return Response(
+            autocomplete(params.validated_data["q"], params.validated_data["limit"])
+        )
+
+
+@extend_schema(
+    tags=["Establishments"],
+    parameters=[ViewportQuerySerializer],
+    responses=ViewportSerializer,
+)
+class MapViewportView(APIView):
+    """
+    Establishments of a map viewport, clustered on the server.
+
+    Establishments inside `bbox` are grouped in one query on a grid of
+    `MAP_CELLS_PER_TILE` cells per map tile at `zoom`, so a zoomed-out map
+    gets a few dozen clusters instead of thousands of venues. Clusters carry
+    their size and how many of their establishments are in happy hours. An
+    establishment alone in its cell is returned with its id and name.
+
+    ### Params:
+    - `bbox`: min_lon,min_lat,max_lon,max_lat
+    - `zoom`: map zoom level, 0 - 22
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = ViewportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        return Response(
+            cluster_establishments(
+                params.validated_data["bbox"], params.validated_data["zoom"]
+            )
+        )
+
+
+@extend_schema(tags=["Establishments"], responses=GeoCacheStatsSerializer)
+class GeoCacheStatsView(APIView):
+    """
+    Hit ratio and average latency of the `near_me` search cache, summed over
+    all processes, for tuning `GEO_CACHE_PRECISION` and the radius buckets.
+    Processes add their counts every `GEO_CACHE_STATS_FLUSH_INTERVAL` seconds.
+    Admin only.
+    """
+
+    permission_classes = [IsAdmin]
+
+    def get(self, request):
+        return Response(geo_cache_stats.snapshot())
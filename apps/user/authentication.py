@@ -0,0 +1,141 @@
+import math
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+    TokenError,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import ClaimsUser
+
+User = get_user_model()
+
+# time of the login the token chain started from, kept through refreshes
+AUTH_TIME_CLAIM = "auth_time"
+REVOKED_KEY = "auth:revoked:{}"
+BLACKLISTED_KEY = "auth:blacklisted:{}"
+
+
+class UserClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token carrying the claims permission classes need, they are
+    copied to every access token issued from it
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token["email"] = user.email
+        token["role"] = user.role
+        token["is_superuser"] = user.is_superuser
+        token["is_blocked"] = user.is_blocked
+        token[AUTH_TIME_CLAIM] = time.time()
+        return token
+
+    def check_blacklist(self):
+        """
+        Blacklisted tokens are mirrored to the cache (see signals). With a
+        shared cache tokens found valid are remembered for a short time too,
+        a miss always falls back to the database
+        """
+        key = BLACKLISTED_KEY.format(self.payload[api_settings.JTI_CLAIM])
+        blacklisted = cache.get(key)
+        if blacklisted:
+            raise TokenError(_("Token is blacklisted"))
+        if blacklisted is None or not settings.TOKEN_BLACKLIST_CACHE:
+            super().check_blacklist()
+            if settings.TOKEN_BLACKLIST_CACHE:
+                # add() never overwrites a concurrent blacklisting
+                cache.add(key, False, timeout=settings.TOKEN_BLACKLIST_CACHE_TTL)
+
+
+def cache_blacklisted_token(jti, expires_at):
+    """
+    Remember a blacklisted token until it expires anyway
+    """
+    timeout = math.ceil((expires_at - timezone.now()).total_seconds())
+    if timeout > 0:
+        cache.set(BLACKLISTED_KEY.format(jti), True, timeout=timeout)
+
+
+def revoke_user_tokens(user_id):
+    """
+    Reject every token issued to the user before now. Stored on the user row,
+    the cache only saves reading it on every request
+    """
+    revoked_at = timezone.now()
+    User.objects.filter(id=user_id).update(tokens_revoked_at=revoked_at)
+    cache.set(
+        REVOKED_KEY.format(user_id),
+        revoked_at.timestamp(),
+        timeout=settings.TOKEN_REVOCATION_CACHE_TTL,
+    )
+
+
+def tokens_revoked_at(user_id):
+    """
+    Timestamp tokens of the user must be issued after, 0 when never revoked.
+    Tokens of deleted users are always rejected
+    """
+    key = REVOKED_KEY.format(user_id)
+    revoked_at = cache.get(key)
+    if revoked_at is None:
+        row = User.objects.filter(id=user_id).values_list("tokens_revoked_at").first()
+        if row is None:
+            revoked_at = math.inf
+        else:
+            revoked_at = row[0].timestamp() if row[0] else 0
+        cache.set(key, revoked_at, timeout=settings.TOKEN_REVOCATION_CACHE_TTL)
+    return revoked_at
+
+
+def load_user_fields(user_id):
+    """
+    Fields of the user which are not token claims, read in one query the first
+    time a view needs any of them. Not cached, the row holds the password hash
+    and changes made by other processes must be seen
+    """
+    field_names = [
+        field.attname
+        for field in User._meta.concrete_fields
+        if field.attname not in ClaimsUser.CLAIM_FIELDS
+    ]
+    values = User.objects.filter(id=user_id).values(*field_names).first()
+    if values is None:
+        raise User.DoesNotExist
+    return values
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication building the user from token claims instead of loading
+    the row on every request. Tokens issued without the claims fall back to
+    the database
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        if validated_token.get(AUTH_TIME_CLAIM, 0) < tokens_revoked_at(user_id):
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+        claims = {"id": user_id}
+        for field in ClaimsUser.CLAIM_FIELDS:
+            if field == "id":
+                continue
+            if field not in validated_token:
+                return super().get_user(validated_token)
+            claims[field] = validated_token[field]
+        return ClaimsUser.from_claims(claims)
@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from apps.user.authentication import cache_blacklisted_token
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes expired outstanding and blacklisted tokens in batches, "
+        "optionally loads the live blacklist into the cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Tokens deleted per statement.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.1,
+            help="Seconds to wait between batches.",
+        )
+        parser.add_argument(
+            "--warm-cache",
+            action="store_true",
+            help="Copy blacklisted tokens which are not expired to the cache.",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        deleted = 0
+        while True:
+            ids = list(
+                OutstandingToken.objects.filter(expires_at__lte=now)
+                .order_by("expires_at")
+                .values_list("id", flat=True)[: options["batch_size"]]
+            )
+            if not ids:
+                break
+            # deletes the blacklist rows of the batch along with the tokens
+            OutstandingToken.objects.filter(id__in=ids).only("id").delete()
+            deleted += len(ids)
+            time.sleep(options["sleep"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired tokens"))
+
+        if options["warm_cache"]:
+            blacklisted = BlacklistedToken.objects.filter(
+                token__expires_at__gt=now
+            ).values_list("token__jti", "token__expires_at")
+            count = 0
+            for jti, expires_at in blacklisted.iterator():
+                cache_blacklisted_token(jti, expires_at)
+                count += 1
+            self.stdout.write(self.style.SUCCESS(f"Cached {count} blacklisted tokens"))
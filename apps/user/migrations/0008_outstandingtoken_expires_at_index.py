@@ -0,0 +1,28 @@
+# Generated by Django 4.2 on 2026-10-18 16:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Index on the expiry of outstanding tokens, used by `prunetokens`. The
+    table belongs to simplejwt's token_blacklist app, hence raw SQL here
+    """
+
+    atomic = False
+
+    dependencies = [
+        ("token_blacklist", "0012_alter_outstandingtoken_user"),
+        ("user", "0007_claimsuser"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+                "token_outstanding_expires_idx "
+                "ON token_blacklist_outstandingtoken (expires_at);"
+            ),
+            reverse_sql="DROP INDEX CONCURRENTLY IF EXISTS token_outstanding_expires_idx;",
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2 on 2026-10-18 18:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0008_outstandingtoken_expires_at_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="tokens_revoked_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Tokens issued before this time are rejected",
+                null=True,
+            ),
+        ),
+    ]
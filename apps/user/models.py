@@ -47,6 +47,9 @@ class User(AbstractUser):
         default=1, help_text="Maximum number of establishments this user can own"
     )
     phone_number = models.CharField(max_length=255, blank=True, null=True)
+    tokens_revoked_at = models.DateTimeField(
+        blank=True, null=True, help_text="Tokens issued before this time are rejected"
+    )
 
     objects = UserManager()
 
@@ -56,3 +59,38 @@ class User(AbstractUser):
 
     def __str__(self):
         return f"{self.role}: {self.email}"
+
+
+class ClaimsUser(User):
+    """
+    User built from access token claims without a database query. Fields not
+    carried by the token are deferred; the first access to any of them loads
+    the rest of the row at once (see apps.user.authentication)
+    """
+
+    CLAIM_FIELDS = ("id", "email", "role", "is_superuser", "is_blocked")
+
+    class Meta:
+        proxy = True
+
+    @classmethod
+    def from_claims(cls, claims):
+        """
+        :param claims: dict with a value for every field of CLAIM_FIELDS
+        """
+        field_names = [
+            field.attname
+            for field in cls._meta.concrete_fields
+            if field.attname in cls.CLAIM_FIELDS
+        ]
+        return cls.from_db(None, field_names, [claims[name] for name in field_names])
+
+    def refresh_from_db(self, using=None, fields=None):
+        from .authentication import load_user_fields
+
+        deferred = self.get_deferred_fields()
+        if fields is None or not deferred.issuperset(fields):
+            return super().refresh_from_db(using=using, fields=fields)
+        for attname, value in load_user_fields(self.pk).items():
+            if attname in deferred:
+                setattr(self, attname, value)
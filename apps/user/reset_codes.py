@@ -0,0 +1,90 @@
+import hashlib
+import secrets
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+
+class ResetCodeStore:
+    """
+    Password reset codes kept in the cache under the user's email, expiring
+    natively after RESET_CODE_TIMEOUT seconds.
+
+    Only a keyed hash of the code is stored. Every check counts as an
+    attempt, RESET_CODE_MAX_ATTEMPTS per email whatever the number of codes
+    requested, until RESET_CODE_TIMEOUT seconds after the first attempt or
+    request. At most RESET_CODE_MAX_ISSUES codes are issued per email in
+    that time. A code can be used once.
+    """
+
+    def __init__(self, cache_alias="default"):
+        self.cache_alias = cache_alias
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    @staticmethod
+    def get_keys(email):
+        digest = hashlib.sha256(email.encode()).hexdigest()
+        return (
+            f"reset-code:{digest}",
+            f"reset-code:attempts:{digest}",
+            f"reset-code:issued:{digest}",
+        )
+
+    @staticmethod
+    def hash_code(email, code):
+        return salted_hmac("reset-code", f"{email}:{code}").hexdigest()
+
+    def count(self, key):
+        """
+        Increment a counter expiring RESET_CODE_TIMEOUT seconds after it started
+        """
+        self.cache.add(key, 0, settings.RESET_CODE_TIMEOUT)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # expired in between, counts as a new period
+            self.cache.add(key, 1, settings.RESET_CODE_TIMEOUT)
+            return 1
+
+    def issue(self, email):
+        """
+        Create a new code for the email, replacing any previous one. Attempts
+        left are not reset
+        :param email:
+        :return: the code to send to the user, None if too many were requested
+        """
+        code_key, _, issued_key = self.get_keys(email)
+        if self.count(issued_key) > settings.RESET_CODE_MAX_ISSUES:
+            return None
+        code = str(1000 + secrets.randbelow(9000))
+        self.cache.set(
+            code_key, self.hash_code(email, code), settings.RESET_CODE_TIMEOUT
+        )
+        return code
+
+    def verify(self, email, code):
+        """
+        Check the code and consume it when it matches
+        :param email:
+        :param code:
+        :return: True if the code is valid
+        """
+        code_key, attempts_key, issued_key = self.get_keys(email)
+        attempts = self.count(attempts_key)
+        code_hash = self.cache.get(code_key)
+        if code_hash is None:
+            return False
+        if attempts > settings.RESET_CODE_MAX_ATTEMPTS:
+            self.cache.delete(code_key)
+            return False
+        if not constant_time_compare(code_hash, self.hash_code(email, code)):
+            return False
+        self.cache.delete_many([code_key, attempts_key, issued_key])
+        return True
+
+
+reset_code_store = ResetCodeStore()
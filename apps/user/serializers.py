@@ -1,8 +1,14 @@
+import time
+
 from django.contrib.auth import get_user_model
-from rest_framework import serializers
+from django.contrib.auth.models import update_last_login
+from rest_framework import exceptions, serializers
 from rest_framework.validators import UniqueValidator
+from rest_framework_simplejwt import serializers as jwt_serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
 
+from apps.user.authentication import UserClaimsRefreshToken
 from apps.user.schema_definitions import (
     client_registration_schema,
     partner_creation_schema,
@@ -17,61 +23,101 @@ from apps.user.schema_definitions import (
     client_list_schema,
     partner_list_schema,
 )
+from apps.user.signals import login_timed
 
 User = get_user_model()
 
 
-@client_partner_login
-class TokenObtainSerializer(TokenObtainPairSerializer):
+class LoginSerializer(TokenObtainPairSerializer):
     """
-    Token Obtaining Serializer
+    Base of the login serializers. One user lookup, one password check and
+    one token issued; time spent in the database and in the password hasher
+    is reported through the `login_timed` signal
     """
 
-    @classmethod
-    def get_token(cls, user):
-        token = super().get_token(user)
-        token["email"] = user.email
-        return token
+    token_class = UserClaimsRefreshToken
+
+    def check_user(self, user):
+        """
+        Raise a ValidationError if the user can not log in with this serializer
+        """
+
+    def get_user_data(self, user):
+        return {"id": user.id, "email": user.email}
 
     def validate(self, attrs):
-        try:
-            user = User.objects.get(email=attrs.get("email"))
-            if not user.is_blocked or user.is_superuser:
-                data = super().validate(attrs)
-                refresh = self.get_token(self.user)
-                data["refresh"] = str(refresh)
-                data["access"] = str(refresh.access_token)
-                data["id"] = user.id
-                data["email"] = user.email
-                data["name"] = user.name
-                data["role"] = user.role
-                data["max_establishments"] = user.max_establishments
-                return data
-            raise serializers.ValidationError("busta straight busta")
-        except User.DoesNotExist:
+        started = time.perf_counter()
+        user = User.objects.filter(email=attrs.get("email")).first()
+        db_time = time.perf_counter() - started
+        if user is None:
             raise serializers.ValidationError("User does not exist")
+        self.check_user(user)
+
+        started = time.perf_counter()
+        password_valid = user.check_password(attrs.get("password"))
+        hash_time = time.perf_counter() - started
+        login_timed.send(
+            sender=self.__class__, user=user, db_time=db_time, hash_time=hash_time
+        )
+        if not password_valid or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise exceptions.AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
+
+        self.user = user
+        refresh = self.get_token(user)
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
+        return {
+            "refresh": str(refresh),
+            "access": str(refresh.access_token),
+            **self.get_user_data(user),
+        }
+
+
+@client_partner_login
+class TokenObtainSerializer(LoginSerializer):
+    """
+    Token Obtaining Serializer
+    """
+
+    def check_user(self, user):
+        if user.is_blocked and not user.is_superuser:
+            raise serializers.ValidationError("busta straight busta")
+
+    def get_user_data(self, user):
+        data = super().get_user_data(user)
+        data["name"] = user.name
+        data["role"] = user.role
+        data["max_establishments"] = user.max_establishments
+        return data
 
 
 @admin_login_schema
-class AdminLoginSerializer(TokenObtainPairSerializer):
+class AdminLoginSerializer(LoginSerializer):
     """
     Token Obtaining Serializer for admin, superuser
     """
 
-    def validate(self, attrs):
-        try:
-            user = User.objects.get(email=attrs.get("email"))
-            if user.role == "admin" or user.is_superuser:
-                data = super().validate(attrs)
-                refresh = self.get_token(self.user)
-                data["refresh"] = str(refresh)
-                data["access"] = str(refresh.access_token)
-                data["id"] = user.id
-                data["email"] = user.email
-                return data
+    def check_user(self, user):
+        if not (user.role == "admin" or user.is_superuser):
             raise serializers.ValidationError("Not admin user")
-        except User.DoesNotExist:
-            raise serializers.ValidationError("User does not exist")
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    """
+    Refresh with the blacklist checked in the cache
+    """
+
+    token_class = UserClaimsRefreshToken
+
+
+class TokenBlacklistSerializer(jwt_serializers.TokenBlacklistSerializer):
+    """
+    Logout, the token is blacklisted in the database and the cache
+    """
+
+    token_class = UserClaimsRefreshToken
 
 
 @admin_block_user_schema
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_save
+from django.dispatch import Signal, receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from .authentication import cache_blacklisted_token
+
+# Sent on every password login with `user`, `db_time` and `hash_time`
+# (seconds spent loading the user and checking the password)
+login_timed = Signal()
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def mirror_blacklisted_token(sender, instance, created, **kwargs):
+    if created:
+        cache_blacklisted_token(instance.token.jti, instance.token.expires_at)
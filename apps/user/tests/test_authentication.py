@@ -0,0 +1,172 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from happyhours.factories import UserFactory
+from ..authentication import (
+    ClaimsJWTAuthentication,
+    UserClaimsRefreshToken,
+    revoke_user_tokens,
+    tokens_revoked_at,
+)
+from ..models import ClaimsUser, User
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    cache.clear()
+
+
+def authenticate(token):
+    authentication = ClaimsJWTAuthentication()
+    return authentication.get_user(authentication.get_validated_token(str(token)))
+
+
+@pytest.mark.django_db
+class TestClaimsJWTAuthentication:
+    def test_user_built_from_claims(self, django_assert_num_queries):
+        user = UserFactory(role="partner")
+        token = UserClaimsRefreshToken.for_user(user).access_token
+        tokens_revoked_at(user.id)
+
+        with django_assert_num_queries(0):
+            request_user = authenticate(token)
+            assert isinstance(request_user, ClaimsUser)
+            assert request_user == user
+            assert request_user.role == "partner"
+            assert not request_user.is_superuser
+
+    def test_other_fields_loaded_once(self, django_assert_num_queries):
+        user = UserFactory(name="Bartender", max_establishments=3)
+        request_user = authenticate(UserClaimsRefreshToken.for_user(user).access_token)
+
+        with django_assert_num_queries(1):
+            assert request_user.name == "Bartender"
+            assert request_user.max_establishments == 3
+
+    def test_other_fields_not_cached(self):
+        user = UserFactory(name="Bartender")
+        token = UserClaimsRefreshToken.for_user(user).access_token
+        assert authenticate(token).name == "Bartender"
+
+        User.objects.filter(id=user.id).update(name="Sommelier")
+
+        assert authenticate(token).name == "Sommelier"
+
+    def test_token_without_claims_loads_user(self, django_assert_num_queries):
+        user = UserFactory()
+        token = UserClaimsRefreshToken.for_user(user).access_token
+        del token["role"]
+        tokens_revoked_at(user.id)
+
+        with django_assert_num_queries(1):
+            request_user = authenticate(token)
+        assert not isinstance(request_user, ClaimsUser)
+        assert request_user == user
+
+    def test_blocked_user_token_revoked(self):
+        admin = UserFactory(role="admin")
+        user = UserFactory(role="client")
+        token = UserClaimsRefreshToken.for_user(user).access_token
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        response = client.post(
+            reverse("v1:block-user"),
+            {"email": user.email, "is_blocked": True},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        response = client.get(reverse("v1:user-profile"))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_profile_update_keeps_token(self):
+        user = UserFactory(role="client")
+        token = UserClaimsRefreshToken.for_user(user).access_token
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        response = client.put(
+            reverse("v1:user-profile"), {"name": "Regular"}, format="json"
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        response = client.get(reverse("v1:user-profile"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["name"] == "Regular"
+
+    def test_login_after_revoke(self):
+        user = UserFactory()
+        revoke_user_tokens(user.id)
+
+        request_user = authenticate(UserClaimsRefreshToken.for_user(user).access_token)
+        assert request_user == user
+
+    def test_revocation_survives_cache_loss(self):
+        user = UserFactory()
+        token = UserClaimsRefreshToken.for_user(user).access_token
+        revoke_user_tokens(user.id)
+        cache.clear()
+
+        with pytest.raises(AuthenticationFailed):
+            authenticate(token)
+
+    def test_deleted_user_token_rejected(self):
+        user = UserFactory()
+        token = UserClaimsRefreshToken.for_user(user).access_token
+        user.delete()
+
+        with pytest.raises(AuthenticationFailed):
+            authenticate(token)
+
+
+@pytest.mark.django_db
+class TestRefreshTokenBlacklist:
+    def test_blacklisted_token_checked_in_cache(self, settings, django_assert_num_queries):
+        settings.TOKEN_BLACKLIST_CACHE = True
+        user = UserFactory()
+        refresh = UserClaimsRefreshToken.for_user(user)
+        client = APIClient()
+
+        response = client.post(
+            reverse("v1:logout"), {"refresh": str(refresh)}, format="json"
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        with django_assert_num_queries(0):
+            response = client.post(
+                reverse("v1:token_refresh"), {"refresh": str(refresh)}, format="json"
+            )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_blacklist_checked_in_database_on_cache_miss(self, settings):
+        settings.TOKEN_BLACKLIST_CACHE = True
+        user = UserFactory()
+        refresh = UserClaimsRefreshToken.for_user(user)
+        client = APIClient()
+        client.post(reverse("v1:logout"), {"refresh": str(refresh)}, format="json")
+        cache.clear()
+
+        response = client.post(
+            reverse("v1:token_refresh"), {"refresh": str(refresh)}, format="json"
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_refresh_keeps_claims(self):
+        user = UserFactory(role="partner")
+        refresh = UserClaimsRefreshToken.for_user(user)
+
+        response = APIClient().post(
+            reverse("v1:token_refresh"), {"refresh": str(refresh)}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        request_user = authenticate(response.data["access"])
+        assert isinstance(request_user, ClaimsUser)
+        assert request_user.role == "partner"
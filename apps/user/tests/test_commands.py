@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from ..authentication import BLACKLISTED_KEY
+
+
+def outstanding_token(jti, expires_in):
+    return OutstandingToken.objects.create(
+        jti=jti, token=jti, expires_at=timezone.now() + expires_in
+    )
+
+
+@pytest.mark.django_db
+def test_prunetokens_deletes_expired_in_batches():
+    for i in range(5):
+        token = outstanding_token(f"expired-{i}", timedelta(hours=-1))
+        BlacklistedToken.objects.create(token=token)
+    live = outstanding_token("live", timedelta(hours=1))
+
+    call_command("prunetokens", batch_size=2, sleep=0)
+
+    assert list(OutstandingToken.objects.all()) == [live]
+    assert not BlacklistedToken.objects.exists()
+
+
+@pytest.mark.django_db
+def test_prunetokens_warm_cache():
+    token = outstanding_token("live", timedelta(hours=1))
+    BlacklistedToken.objects.create(token=token)
+    cache.clear()
+
+    call_command("prunetokens", warm_cache=True)
+
+    assert cache.get(BLACKLISTED_KEY.format("live"))
@@ -1,17 +1,23 @@
-import datetime
+from unittest.mock import patch
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from ..utils import datetime_serializer
+from ..reset_codes import reset_code_store
 
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
 @pytest.mark.django_db
 class TestUserAPI:
     client = APIClient()
@@ -57,14 +63,70 @@ class TestUserAPI:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
     def test_reset_code(self):
-        session = self.client.session
-        session["reset_code"] = "9267"
-        session["reset_code_create_time"] = datetime_serializer(datetime.datetime.now())
-        session.save()
+        code = reset_code_store.issue("email@example.com")
         url = reverse("v1:password-reset")
         data = {
             "email": "email@example.com",
-            "reset_code": "9263",
+            "reset_code": "1" if code == "1000" else "1000",
         }
         response = self.client.post(url, data, format="json")
         assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_reset_code_valid_once(self, django_user_model):
+        django_user_model.objects.create_user(
+            email="email@example.com", password="somepassword1", role="client"
+        )
+        code = reset_code_store.issue("email@example.com")
+        url = reverse("v1:password-reset")
+        data = {"email": "email@example.com", "reset_code": code}
+
+        response = self.client.post(url, data, format="json")
+        assert response.status_code == status.HTTP_200_OK
+        assert "access" in response.data
+
+        response = self.client.post(url, data, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_reset_code_attempts_limited(self, settings, django_user_model):
+        settings.RESET_CODE_MAX_ATTEMPTS = 2
+        django_user_model.objects.create_user(
+            email="email@example.com", password="somepassword1", role="client"
+        )
+        code = reset_code_store.issue("email@example.com")
+        url = reverse("v1:password-reset")
+        wrong = "1000" if code != "1000" else "1001"
+
+        for _ in range(2):
+            data = {"email": "email@example.com", "reset_code": wrong}
+            self.client.post(url, data, format="json")
+        data = {"email": "email@example.com", "reset_code": code}
+        response = self.client.post(url, data, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_new_code_keeps_attempts(self, settings, django_user_model):
+        settings.RESET_CODE_MAX_ATTEMPTS = 2
+        django_user_model.objects.create_user(
+            email="email@example.com", password="somepassword1", role="client"
+        )
+        url = reverse("v1:password-reset")
+        for _ in range(2):
+            code = reset_code_store.issue("email@example.com")
+            wrong = "1000" if code != "1000" else "1001"
+            data = {"email": "email@example.com", "reset_code": wrong}
+            self.client.post(url, data, format="json")
+
+        code = reset_code_store.issue("email@example.com")
+        data = {"email": "email@example.com", "reset_code": code}
+        response = self.client.post(url, data, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_reset_code_issues_limited(self, settings):
+        settings.RESET_CODE_MAX_ISSUES = 1
+        url = reverse("v1:password-forgot-page")
+        data = {"email": "email@example.com"}
+
+        with patch("apps.user.views.send_reset_code_email"):
+            response = self.client.post(url, data, format="json")
+            assert response.status_code == status.HTTP_200_OK
+            response = self.client.post(url, data, format="json")
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
@@ -0,0 +1,89 @@
+from unittest.mock import patch
+
+import pytest
+from django.core import mail
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from happyhours.mail import MailQueue, mail_queue
+from ..utils import send_reset_code_email
+
+
+@pytest.fixture
+def manual_mail_queue(monkeypatch):
+    monkeypatch.setattr(mail_queue, "autostart", False)
+    yield mail_queue
+    mail_queue.flush()
+
+
+def test_reset_code_email_is_queued(manual_mail_queue):
+    send_reset_code_email("user@example.com", "1234")
+    assert mail.outbox == []
+
+    manual_mail_queue.flush()
+
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == ["user@example.com"]
+    assert "1234" in mail.outbox[0].body
+
+
+@pytest.mark.django_db
+def test_forgot_password_only_enqueues(manual_mail_queue, django_user_model):
+    django_user_model.objects.create_user(
+        email="user@example.com", password="somepassword1", role="client"
+    )
+
+    response = APIClient().post(
+        reverse("v1:password-forgot-page"), {"email": "user@example.com"}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert mail.outbox == []
+    assert manual_mail_queue.queue.qsize() == 1
+
+
+def test_batch_shares_connection():
+    queue = MailQueue(batch_size=10, autostart=False)
+    for i in range(3):
+        queue.enqueue(mail.EmailMessage("Subject", "Body", None, [f"{i}@example.com"]))
+
+    with patch("happyhours.mail.get_connection", wraps=mail.get_connection) as mock_get:
+        queue.flush()
+
+    assert mock_get.call_count == 1
+    assert len(mail.outbox) == 3
+
+
+def test_failed_message_retried_with_backoff():
+    queue = MailQueue(max_retries=2, backoff=0.5, autostart=False)
+    queue.enqueue(mail.EmailMessage("Subject", "Body", None, ["user@example.com"]))
+    connection = mail.get_connection()
+    send_messages = connection.send_messages
+    calls = []
+
+    def flaky_send(messages):
+        calls.append(messages)
+        if len(calls) == 1:
+            raise OSError("connection reset")
+        return send_messages(messages)
+
+    with patch("happyhours.mail.get_connection", return_value=connection), patch.object(
+        connection, "send_messages", side_effect=flaky_send
+    ), patch("happyhours.mail.time.sleep") as mock_sleep:
+        queue.flush()
+
+    assert len(calls) == 2
+    mock_sleep.assert_called_once_with(0.5)
+    assert len(mail.outbox) == 1
+
+
+def test_stop_drains_queue():
+    queue = MailQueue(window=0)
+    for i in range(3):
+        queue.enqueue(mail.EmailMessage("Subject", "Body", None, [f"{i}@example.com"]))
+
+    queue.stop(timeout=5)
+
+    assert len(mail.outbox) == 3
+    assert not queue._worker.is_alive()
@@ -1,9 +1,17 @@
 import pytest
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
 
 from happyhours.factories import UserFactory
 from django.test import RequestFactory
 
-from ..serializers import UserSerializer, PartnerProfileSerializer
+from ..serializers import (
+    UserSerializer,
+    PartnerProfileSerializer,
+    TokenObtainSerializer,
+    AdminLoginSerializer,
+)
+from ..signals import login_timed
 
 
 @pytest.fixture
@@ -33,3 +41,46 @@ def test_validate_client(client_user, mock_request):
 def test_validate_partner(partner_user, mock_request):
     serializer = PartnerProfileSerializer(context={"request": mock_request})
     assert serializer.validate(partner_user) == partner_user
+
+
+@pytest.mark.django_db
+def test_login_single_lookup_and_token(client_user, django_assert_num_queries):
+    serializer = TokenObtainSerializer(
+        data={"email": client_user.email, "password": "defaultpassword123"}
+    )
+    timings = []
+
+    def receiver(sender, user, db_time, hash_time, **kwargs):
+        timings.append((user, db_time, hash_time))
+
+    login_timed.connect(receiver)
+    try:
+        # user lookup, outstanding token insert
+        with django_assert_num_queries(2):
+            assert serializer.is_valid(), serializer.errors
+    finally:
+        login_timed.disconnect(receiver)
+
+    assert serializer.validated_data["id"] == client_user.id
+    assert serializer.validated_data["role"] == "client"
+    assert OutstandingToken.objects.filter(user=client_user).count() == 1
+    assert timings[0][0] == client_user
+    assert timings[0][1] >= 0 and timings[0][2] > 0
+
+
+@pytest.mark.django_db
+def test_login_wrong_password(client_user):
+    serializer = TokenObtainSerializer(
+        data={"email": client_user.email, "password": "wrongpassword"}
+    )
+    with pytest.raises(AuthenticationFailed):
+        serializer.is_valid()
+
+
+@pytest.mark.django_db
+def test_admin_login_rejects_client(client_user):
+    serializer = AdminLoginSerializer(
+        data={"email": client_user.email, "password": "defaultpassword123"}
+    )
+    assert not serializer.is_valid()
+    assert OutstandingToken.objects.count() == 0
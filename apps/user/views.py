@@ -1,9 +1,8 @@
-import datetime
-
 from django.contrib.auth import get_user_model
 
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
+from rest_framework.exceptions import Throttled
 from rest_framework.generics import (
     RetrieveAPIView,
     UpdateAPIView,
@@ -15,9 +14,9 @@ from rest_framework.generics import (
 )
 from rest_framework.response import Response
 from rest_framework.viewsets import ViewSetMixin
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 
+from happyhours.pagination import KeysetPagination
 from happyhours.permissions import (
     IsUserOwner,
     IsPartnerAndAdmin,
@@ -26,6 +25,8 @@ from happyhours.permissions import (
     IsAuthenticatedAndNotAdmin,
 )
 
+from .authentication import UserClaimsRefreshToken, revoke_user_tokens
+from .models import ClaimsUser
 from .serializers import (
     UserSerializer,
     TokenObtainSerializer,
@@ -41,12 +42,8 @@ from .serializers import (
     PartnerProfileSerializer,
     UserSerializerAdmin,
 )
-from .utils import (
-    generate_reset_code,
-    datetime_serializer,
-    datetime_deserializer,
-    send_reset_code_email,
-)
+from .reset_codes import reset_code_store
+from .utils import send_reset_code_email
 
 User = get_user_model()
 
@@ -121,7 +118,7 @@ class ClientRegisterView(CreateAPIView):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
-        token = RefreshToken.for_user(user)
+        token = UserClaimsRefreshToken.for_user(user)
         data = serializer.data
         data["tokens"] = {"refresh": str(token), "access": str(token.access_token)}
         headers = self.get_success_headers(serializer.data)
@@ -152,7 +149,7 @@ class ClientPasswordChangeView(GenericAPIView):
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = User.objects.get(email=self.request.user.email)
+        user = User.objects.get(id=self.request.user.id)
         user.set_password(serializer.validated_data["password"])
         user.save()
         return Response("Password successfully changed", status=status.HTTP_200_OK)
@@ -191,6 +188,13 @@ class UserViewSet(ViewSetMixin, RetrieveAPIView, UpdateAPIView, DestroyAPIView):
                 return PartnerProfileSerializer
         return UserSerializer
 
+    def perform_update(self, serializer):
+        claims = [getattr(serializer.instance, f) for f in ClaimsUser.CLAIM_FIELDS]
+        user = serializer.save()
+        # issued tokens carry the old email
+        if claims != [getattr(user, f) for f in ClaimsUser.CLAIM_FIELDS]:
+            revoke_user_tokens(user.id)
+
 
 @extend_schema(tags=["Users"])
 class UserViewSetAdmin(ViewSetMixin, RetrieveAPIView, UpdateAPIView, DestroyAPIView):
@@ -216,6 +220,18 @@ class UserViewSetAdmin(ViewSetMixin, RetrieveAPIView, UpdateAPIView, DestroyAPIV
     permission_classes = [IsAdmin]
     serializer_class = UserSerializerAdmin
 
+    def perform_update(self, serializer):
+        claims = [getattr(serializer.instance, f) for f in ClaimsUser.CLAIM_FIELDS]
+        user = serializer.save()
+        # issued tokens carry the old role or block state
+        if claims != [getattr(user, f) for f in ClaimsUser.CLAIM_FIELDS]:
+            revoke_user_tokens(user.id)
+
+    def perform_destroy(self, instance):
+        user_id = instance.id
+        instance.delete()
+        revoke_user_tokens(user_id)
+
 
 @extend_schema(tags=["Users"])
 class CreatePartner(CreateAPIView):
@@ -250,9 +266,11 @@ class ClientListView(ListAPIView):
     List of clients. View responsible for listing of client users.
 
     ### Params:
-    - `limit`: Quantity of items
-    - `offset`: Start index of the items
+    - `cursor`: Page cursor, taken from `next`/`previous`
+    - `page_size`: Quantity of items
+    - `count`: `approximate` or `exact` adds the total count
     - `search` : Text-based search
+    - `limit`, `offset`: Deprecated, still accepted
 
     ### Access Control:
     - Partner, Admin, Superuser
@@ -262,6 +280,8 @@ class ClientListView(ListAPIView):
     queryset = User.objects.all().filter(role="client").order_by("id")
     serializer_class = ClientListSerializer
     permission_classes = [IsPartnerAndAdmin]
+    pagination_class = KeysetPagination
+    keyset_ordering = "id"
 
 
 @extend_schema(tags=["Users"])
@@ -270,9 +290,11 @@ class PartnerListView(ListAPIView):
     List of partners
 
     ### Params:
-    - `limit`: Quantity of items
-    - `offset`: Start index of the items
+    - `cursor`: Page cursor, taken from `next`/`previous`
+    - `page_size`: Quantity of items
+    - `count`: `approximate` or `exact` adds the total count
     - `search` : Text-based search
+    - `limit`, `offset`: Deprecated, still accepted
 
     ### Access Control:
     - Admin, Superuser
@@ -282,6 +304,8 @@ class PartnerListView(ListAPIView):
     queryset = User.objects.all().filter(role="partner").order_by("id")
     serializer_class = PartnerListSerializer
     permission_classes = [IsAdmin]
+    pagination_class = KeysetPagination
+    keyset_ordering = "id"
 
 
 @extend_schema(tags=["Users"])
@@ -299,6 +323,7 @@ class BlockUserView(GenericAPIView):
 
     ### Implementation Details:
     - Throw an error if state did not change
+    - Tokens already issued to a blocked user are revoked
 
     """
 
@@ -312,6 +337,9 @@ class BlockUserView(GenericAPIView):
         user = User.objects.get(email=serializer.validated_data["email"])
         user.is_blocked = serializer.validated_data["is_blocked"]
         user.save()
+        if user.is_blocked:
+            # access tokens stay valid until expiry otherwise
+            revoke_user_tokens(user.id)
         return Response("Successful", status=status.HTTP_200_OK)
 
 
@@ -330,6 +358,8 @@ class ClientPasswordForgotPageView(GenericAPIView):
     ### Implementation Details:
     - Happy Hours does not check if user's email is legit. If email does not
     exist, error won't be displayed
+    - At most `RESET_CODE_MAX_ISSUES` codes per email every 10 minutes,
+    429 after that
 
     """
 
@@ -338,12 +368,11 @@ class ClientPasswordForgotPageView(GenericAPIView):
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        reset_code = generate_reset_code()
-        user = serializer.validated_data["email"]
-        request.session["reset_code"] = str(reset_code)
-        time_now = datetime.datetime.now()
-        request.session["reset_code_create_time"] = datetime_serializer(time_now)
-        send_reset_code_email(user, reset_code)
+        email = serializer.validated_data["email"]
+        reset_code = reset_code_store.issue(email)
+        if reset_code is None:
+            raise Throttled(detail="Too many reset codes requested, try again later.")
+        send_reset_code_email(email, reset_code)
         return Response("Success", status=status.HTTP_200_OK)
 
 
@@ -361,7 +390,10 @@ class ClientPasswordResetView(GenericAPIView):
     - Everybody
 
     ### Implementation Details:
-    - Reset code valid only 5 minutes after email sending
+    - Reset code valid only 10 minutes after email sending
+    - 5 attempts per email every 10 minutes, requesting a new code does not
+    give more
+    - A code can be used once
 
     """
 
@@ -371,26 +403,11 @@ class ClientPasswordResetView(GenericAPIView):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        reset_code = serializer.validated_data["reset_code"]
-
-        if (
-            "reset_code" in request.session
-            and "reset_code_create_time" in request.session
-        ):
-            stored_code = request.session["reset_code"]
-            stored_code_date = datetime_deserializer(
-                request.session["reset_code_create_time"]
-            )
-            passed_time = datetime.datetime.now()
-
-            if (
-                stored_code == reset_code
-                and (passed_time - stored_code_date).total_seconds() < 600
-            ):
-                user = User.objects.get(email=serializer.validated_data["email"])
-                token = RefreshToken.for_user(user)
-                request.session["reset_code"] = ""
-                request.session["reset_code_create_time"] = ""
+        email = serializer.validated_data["email"]
+        if reset_code_store.verify(email, serializer.validated_data["reset_code"]):
+            user = User.objects.filter(email=email).first()
+            if user is not None:
+                token = UserClaimsRefreshToken.for_user(user)
                 return Response(
                     {"refresh": str(token), "access": str(token.access_token)}
                 )
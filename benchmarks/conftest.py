@@ -0,0 +1,206 @@
+import json
+import os
+import random
+from pathlib import Path
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.gis.geos import Point
+from faker import Faker
+
+from apps.analytics.rollups import rebuild_order_rollups
+from apps.beverage.models import Beverage
+from apps.feedback.models import Feedback, FeedbackAnswer
+from apps.order.models import Order
+from apps.partner.models import Establishment, HappyHourSchedule
+from apps.partner.search import (
+    update_beverage_search_vectors,
+    update_establishment_search_vectors,
+)
+from happyhours.factories import (
+    BeverageFactory,
+    CategoryFactory,
+    EstablishmentFactory,
+    FeedbackAnswerFactory,
+    FeedbackFactory,
+)
+
+User = get_user_model()
+
+BUDGETS_PATH = Path(__file__).with_name("budgets.json")
+PASSWORD = "benchmarkpassword1"
+
+# Seeded volumes, multiplied by BENCHMARK_SCALE
+SCALE = float(os.getenv("BENCHMARK_SCALE", 1))
+VOLUMES = {
+    "clients": int(2000 * SCALE),
+    "partners": int(500 * SCALE),
+    "establishments": int(2000 * SCALE),
+    "categories": 20,
+    "beverages": int(20000 * SCALE),
+    "orders": int(20000 * SCALE),
+    "feedback": int(10000 * SCALE),
+    "answers": int(5000 * SCALE),
+}
+BATCH_SIZE = 1000
+# Bishkek
+CENTER = (74.6122, 42.8746)
+
+fake = Faker()
+Faker.seed(0)
+random.seed(0)
+
+
+def bulk_build(factory, count, **kwargs):
+    """
+    Build unsaved instances with a factory and insert them in batches
+    """
+    model = factory._meta.model
+    return model.objects.bulk_create(
+        factory.build_batch(count, **kwargs), batch_size=BATCH_SIZE
+    )
+
+
+def build_users(role, count, password):
+    return User.objects.bulk_create(
+        [
+            User(
+                email=f"{role}{index}@benchmark.kg",
+                name=fake.name(),
+                role=role,
+                password=password,
+                max_establishments=10,
+            )
+            for index in range(count)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def seed():
+    """
+    Seed realistic volumes. Users share one password hash, hashing
+    thousands of passwords would dominate the seeding time.
+    """
+    password = make_password(PASSWORD)
+    clients = build_users("client", VOLUMES["clients"], password)
+    partners = build_users("partner", VOLUMES["partners"], password)
+    admin = build_users("admin", 1, password)[0]
+
+    establishments = Establishment.objects.bulk_create(
+        [
+            EstablishmentFactory.build(
+                owner=random.choice(partners),
+                location=Point(
+                    CENTER[0] + random.uniform(-0.1, 0.1),
+                    CENTER[1] + random.uniform(-0.1, 0.1),
+                    srid=4326,
+                ),
+                happyhours_start="00:00:00",
+                happyhours_end="23:59:00",
+            )
+            for _ in range(VOLUMES["establishments"])
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    # bulk_create skips signals, build the happy hours schedule explicitly
+    for establishment in establishments:
+        HappyHourSchedule.rebuild_for(establishment)
+
+    categories = bulk_build(CategoryFactory, VOLUMES["categories"])
+    beverages = Beverage.objects.bulk_create(
+        [
+            BeverageFactory.build(
+                establishment=random.choice(establishments),
+                category=random.choice(categories),
+                availability_status=True,
+            )
+            for _ in range(VOLUMES["beverages"])
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    # and the search vectors
+    update_establishment_search_vectors(Establishment.objects.all())
+    update_beverage_search_vectors(Beverage.objects.all())
+    orders = []
+    for _ in range(VOLUMES["orders"]):
+        beverage = random.choice(beverages)
+        orders.append(
+            Order(
+                establishment_id=beverage.establishment_id,
+                beverage=beverage,
+                client=random.choice(clients),
+                status=random.choice(Order.STATUS_CHOICES)[0],
+            )
+        )
+    Order.objects.bulk_create(orders, batch_size=BATCH_SIZE)
+    # bulk_create skips signals too, count the orders into the rollups
+    rebuild_order_rollups(batch_size=BATCH_SIZE)
+    feedback = Feedback.objects.bulk_create(
+        [
+            FeedbackFactory.build(
+                user=random.choice(clients), establishment=random.choice(establishments)
+            )
+            for _ in range(VOLUMES["feedback"])
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    FeedbackAnswer.objects.bulk_create(
+        [
+            FeedbackAnswerFactory.build(feedback=random.choice(feedback), user=admin)
+            for _ in range(VOLUMES["answers"])
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+    partner = establishments[0].owner
+    return {
+        "client": clients[0],
+        "partner": partner,
+        "admin": admin,
+        "establishment": establishments[0],
+        "beverage": Beverage.objects.filter(establishment=establishments[0]).first()
+        or beverages[0],
+        "category": categories[0],
+        "feedback": feedback[0],
+        "answer": FeedbackAnswer.objects.first(),
+    }
+
+
+@pytest.fixture(scope="session")
+def seeded(django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        return seed()
+
+
+@pytest.fixture(scope="session")
+def budgets():
+    with open(BUDGETS_PATH) as budgets_file:
+        return json.load(budgets_file)
+
+
+@pytest.fixture(scope="session")
+def benchmark_results():
+    """
+    Measurements of the session. With BENCHMARK_UPDATE_BUDGETS=1 they are
+    written back to budgets.json instead of being checked.
+    """
+    results = {}
+    yield results
+    if os.getenv("BENCHMARK_UPDATE_BUDGETS") and results:
+        with open(BUDGETS_PATH) as budgets_file:
+            current = json.load(budgets_file)
+        for route, result in results.items():
+            current[route] = {
+                "queries": result["queries"],
+                # leave headroom for noisy machines
+                "p95_ms": round(result["p95_ms"] * 2 + 5, 1),
+            }
+        with open(BUDGETS_PATH, "w") as budgets_file:
+            json.dump(dict(sorted(current.items())), budgets_file, indent=2)
+            budgets_file.write("\n")
+    report = os.getenv("BENCHMARK_REPORT")
+    if report:
+        with open(report, "w") as report_file:
+            json.dump(results, report_file, indent=2)
@@ -0,0 +1,82 @@
+"""
+Share of database connection setup in request latency.
+
+    pytest benchmarks/test_connections.py -m benchmark --ds=happyhours.settings.benchmark
+
+The same route is requested with CONN_MAX_AGE=0, every request opening and
+closing its own connection as without a pooler, and with a persistent
+connection. The test client does not close connections between requests,
+the `close_old_connections` calls Django makes around every request are
+made here. Runs outside a test transaction, which would keep the
+connection open.
+"""
+
+import os
+import statistics
+import time
+
+import pytest
+from django.db import close_old_connections, connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.user.authentication import UserClaimsRefreshToken
+
+pytestmark = pytest.mark.benchmark
+
+ITERATIONS = int(os.getenv("BENCHMARK_ITERATIONS", 20))
+
+
+def measure(client, path, max_age):
+    """
+    :param max_age: CONN_MAX_AGE of the requests, None for persistent
+    """
+    connection.settings_dict["CONN_MAX_AGE"] = max_age
+    # the connection left by a previous run has its own expiry
+    connection.close()
+    client.get(path)
+    close_old_connections()
+
+    timings = []
+    with CaptureQueriesContext(connection) as context:
+        for _ in range(ITERATIONS):
+            start = time.perf_counter()
+            close_old_connections()
+            response = client.get(path)
+            close_old_connections()
+            timings.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200
+    return {
+        "queries": len(context.captured_queries) // ITERATIONS,
+        "p50_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(statistics.quantiles(timings, n=100)[94], 2),
+    }
+
+
+def test_connection_setup_latency(seeded, django_db_blocker, budgets, benchmark_results):
+    path = f"/api/v1/partner/establishments/{seeded['establishment'].id}/"
+    max_age = connection.settings_dict["CONN_MAX_AGE"]
+    with django_db_blocker.unblock():
+        client = APIClient()
+        token = UserClaimsRefreshToken.for_user(seeded["client"]).access_token
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        try:
+            results = {
+                "request-new-connection": measure(client, path, 0),
+                "request-persistent-connection": measure(client, path, None),
+            }
+        finally:
+            connection.settings_dict["CONN_MAX_AGE"] = max_age
+            connection.close()
+    benchmark_results.update(results)
+    if os.getenv("BENCHMARK_UPDATE_BUDGETS"):
+        return
+
+    for name, result in results.items():
+        budget = budgets[name]
+        assert (
+            result["queries"] <= budget["queries"]
+        ), f"{name}: {result['queries']} queries, budget {budget['queries']}"
+        assert (
+            result["p95_ms"] <= budget["p95_ms"]
+        ), f"{name}: p95 {result['p95_ms']} ms, budget {budget['p95_ms']} ms"
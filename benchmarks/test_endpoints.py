@@ -0,0 +1,395 @@
+"""
+Query-count and latency benchmarks for every route of the v1 API.
+
+    pytest benchmarks -m benchmark --ds=happyhours.settings.benchmark
+
+Each route is requested BENCHMARK_ITERATIONS times, every iteration is rolled
+back so writes see the same data. The query count of the first (cold)
+request and the p95 latency are checked against `budgets.json`.
+Run with BENCHMARK_UPDATE_BUDGETS=1 to record new budgets instead.
+"""
+
+import os
+import statistics
+import time
+from collections import namedtuple
+
+import pytest
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver, resolve
+from rest_framework.test import APIClient
+
+from apps.user.authentication import UserClaimsRefreshToken
+
+from .conftest import CENTER, PASSWORD
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+ITERATIONS = int(os.getenv("BENCHMARK_ITERATIONS", 20))
+V1 = "/api/v1"
+
+Route = namedtuple("Route", "name method path user data", defaults=(None, None))
+
+ROUTES = [
+    # beverage
+    Route(
+        "category-list",
+        "get",
+        lambda s: f"{V1}/beverage/categories/?limit=20",
+        "client",
+    ),
+    Route(
+        "category-detail",
+        "get",
+        lambda s: f"{V1}/beverage/categories/{s['category'].id}/",
+        "client",
+    ),
+    Route(
+        "category-create",
+        "post",
+        lambda s: f"{V1}/beverage/categories/",
+        "admin",
+        lambda s: {"name": "Benchmark"},
+    ),
+    Route(
+        "beverage-list", "get", lambda s: f"{V1}/beverage/beverages/?limit=20", "client"
+    ),
+    Route(
+        "beverage-list-search",
+        "get",
+        lambda s: f"{V1}/beverage/beverages/?limit=20&search=a",
+        "client",
+    ),
+    Route(
+        "beverage-list-happy-hour",
+        "get",
+        lambda s: f"{V1}/beverage/beverages/?limit=20&in_happy_hour=true",
+        "client",
+    ),
+    Route(
+        "beverage-detail",
+        "get",
+        lambda s: f"{V1}/beverage/beverages/{s['beverage'].id}/",
+        "client",
+    ),
+    Route(
+        "beverage-create",
+        "post",
+        lambda s: f"{V1}/beverage/beverages/",
+        "partner",
+        lambda s: {
+            "name": "Benchmark",
+            "price": "1.00",
+            "description": "Benchmark beverage",
+            "establishment": s["establishment"].id,
+            "category": s["category"].id,
+        },
+    ),
+    Route(
+        "beverage-update",
+        "patch",
+        lambda s: f"{V1}/beverage/beverages/{s['beverage'].id}/",
+        "partner",
+        lambda s: {"description": "Updated"},
+    ),
+    # order
+    Route(
+        "place-order",
+        "post",
+        lambda s: f"{V1}/order/place-order/",
+        "client",
+        lambda s: {"beverage": s["beverage"].id},
+    ),
+    Route(
+        "client-order-history",
+        "get",
+        lambda s: f"{V1}/order/client-order-history/?limit=20",
+        "client",
+    ),
+    Route(
+        "partner-order-history",
+        "get",
+        lambda s: f"{V1}/order/partner-order-history/?limit=20",
+        "partner",
+    ),
+    # partner
+    Route(
+        "establishment-list",
+        "get",
+        lambda s: f"{V1}/partner/establishments/?limit=20",
+        "client",
+    ),
+    Route(
+        "establishment-list-search",
+        "get",
+        lambda s: f"{V1}/partner/establishments/?limit=20&search=a",
+        "client",
+    ),
+    Route(
+        "establishment-list-near-me",
+        "get",
+        lambda s: (
+            f"{V1}/partner/establishments/?limit=20&near_me=2000&ordering=distance"
+            f"&longitude={CENTER[0]}&latitude={CENTER[1]}"
+        ),
+        "client",
+    ),
+    Route(
+        "establishment-list-happyhours",
+        "get",
+        lambda s: f"{V1}/partner/establishments/?limit=20&happyhours_active=true",
+        "client",
+    ),
+    Route(
+        "establishment-detail",
+        "get",
+        lambda s: f"{V1}/partner/establishments/{s['establishment'].id}/",
+        "client",
+    ),
+    Route(
+        "establishment-update",
+        "patch",
+        lambda s: f"{V1}/partner/establishments/{s['establishment'].id}/",
+        "partner",
+        lambda s: {"description": "Updated"},
+    ),
+    Route(
+        "menu-list",
+        "get",
+        lambda s: f"{V1}/partner/menu/{s['establishment'].id}/",
+        "client",
+    ),
+    Route(
+        "map-viewport",
+        "get",
+        lambda s: (
+            f"{V1}/partner/map/?zoom=12&bbox={CENTER[0] - 0.1},{CENTER[1] - 0.1},"
+            f"{CENTER[0] + 0.1},{CENTER[1] + 0.1}"
+        ),
+        "client",
+    ),
+    Route(
+        "geo-cache-stats",
+        "get",
+        lambda s: f"{V1}/partner/geo-cache/stats/",
+        "admin",
+    ),
+    Route(
+        "autocomplete",
+        "get",
+        lambda s: f"{V1}/partner/autocomplete/?q=a",
+        "client",
+    ),
+    # user
+    Route(
+        "token",
+        "post",
+        lambda s: f"{V1}/user/token/",
+        None,
+        lambda s: {"email": s["client"].email, "password": PASSWORD},
+    ),
+    Route(
+        "token-refresh",
+        "post",
+        lambda s: f"{V1}/user/token/refresh/",
+        None,
+        lambda s: {"refresh": s["refresh"]},
+    ),
+    Route(
+        "admin-login",
+        "post",
+        lambda s: f"{V1}/user/token/admin/",
+        None,
+        lambda s: {"email": s["admin"].email, "password": PASSWORD},
+    ),
+    Route(
+        "client-register",
+        "post",
+        lambda s: f"{V1}/user/client_register/",
+        None,
+        lambda s: {
+            "email": "new-client@benchmark.kg",
+            "password": PASSWORD,
+            "password_confirm": PASSWORD,
+            "name": "Benchmark",
+        },
+    ),
+    Route("client-list", "get", lambda s: f"{V1}/user/client_list/?limit=20", "admin"),
+    Route("partner-list", "get", lambda s: f"{V1}/user/partner_list?limit=20", "admin"),
+    Route(
+        "block-user",
+        "post",
+        lambda s: f"{V1}/user/block_user/",
+        "admin",
+        lambda s: {"email": s["client"].email, "is_blocked": True},
+    ),
+    Route(
+        "logout",
+        "post",
+        lambda s: f"{V1}/user/logout/",
+        None,
+        lambda s: {"refresh": s["refresh"]},
+    ),
+    Route(
+        "create-partner",
+        "post",
+        lambda s: f"{V1}/user/create_partner/",
+        "admin",
+        lambda s: {
+            "email": "new-partner@benchmark.kg",
+            "name": "Benchmark",
+            "password": PASSWORD,
+            "password_confirm": PASSWORD,
+            "max_establishments": 1,
+        },
+    ),
+    Route("user-profile", "get", lambda s: f"{V1}/user/", "client"),
+    Route(
+        "user-profile-admin",
+        "get",
+        lambda s: f"{V1}/user/profiles_admin/{s['client'].id}/",
+        "admin",
+    ),
+    Route(
+        "password-forgot",
+        "post",
+        lambda s: f"{V1}/user/password_forgot/",
+        None,
+        lambda s: {"email": s["client"].email},
+    ),
+    Route(
+        "password-reset",
+        "post",
+        lambda s: f"{V1}/user/password_reset/",
+        None,
+        lambda s: {"email": s["client"].email, "reset_code": "0000"},
+    ),
+    Route(
+        "password-change",
+        "post",
+        lambda s: f"{V1}/user/password_change/",
+        "client",
+        lambda s: {"password": PASSWORD, "password_confirm": PASSWORD},
+    ),
+    # feedback
+    Route(
+        "feedback-detail",
+        "get",
+        lambda s: f"{V1}/feedback/feedbacks/{s['feedback'].id}/",
+        "client",
+    ),
+    Route("feedback-list", "get", lambda s: f"{V1}/feedback/feedbacks/list/", "client"),
+    Route(
+        "feedback-create",
+        "post",
+        lambda s: f"{V1}/feedback/feedbacks/create/",
+        "client",
+        lambda s: {
+            "user": s["client"].id,
+            "establishment": s["establishment"].id,
+            "text": "Benchmark",
+        },
+    ),
+    Route(
+        "answer-create",
+        "post",
+        lambda s: f"{V1}/feedback/answers/create/",
+        "admin",
+        lambda s: {
+            "feedback": s["feedback"].id,
+            "user": s["admin"].id,
+            "text": "Benchmark",
+        },
+    ),
+    Route(
+        "answer-detail",
+        "get",
+        lambda s: f"{V1}/feedback/answers/{s['answer'].id}/",
+        "client",
+    ),
+    # analytics
+    Route(
+        "order-dashboard",
+        "get",
+        lambda s: f"{V1}/analytics/establishments/{s['establishment'].id}/dashboard/",
+        "partner",
+    ),
+]
+
+
+def v1_routes():
+    """
+    Route patterns of the v1 API, without router format suffixes and api roots
+    """
+    routes = set()
+
+    def walk(patterns, prefix):
+        for pattern in patterns:
+            route = str(pattern.pattern)
+            # same joining as ResolverMatch.route
+            if prefix and route.startswith("^"):
+                route = route[1:]
+            route = prefix + route
+            if hasattr(pattern, "url_patterns"):
+                walk(pattern.url_patterns, route)
+            elif pattern.name != "api-root" and "(?P<format>" not in route:
+                routes.add(route)
+
+    walk(get_resolver().url_patterns, "")
+    return {route for route in routes if route.startswith("api/v1/")}
+
+
+def request(client, route, seeded):
+    data = route.data(seeded) if route.data else None
+    return getattr(client, route.method)(route.path(seeded), data, format="json")
+
+
+def test_every_v1_route_is_benchmarked(seeded):
+    benchmarked = {resolve(route.path(seeded).split("?")[0]).route for route in ROUTES}
+    assert v1_routes() - benchmarked == set()
+
+
+@pytest.mark.parametrize("route", ROUTES, ids=[route.name for route in ROUTES])
+def test_route_budget(route, seeded, budgets, benchmark_results):
+    seeded = dict(
+        seeded, refresh=str(UserClaimsRefreshToken.for_user(seeded["client"]))
+    )
+    client = APIClient()
+    if route.user:
+        # a real bearer token, so authentication is part of the measurement
+        token = UserClaimsRefreshToken.for_user(seeded[route.user]).access_token
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    cache.clear()
+
+    timings = []
+    queries = None
+    for _ in range(ITERATIONS):
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as context:
+                start = time.perf_counter()
+                response = request(client, route, seeded)
+                timings.append((time.perf_counter() - start) * 1000)
+            if queries is None:
+                queries = len(context.captured_queries)
+            transaction.set_rollback(True)
+        assert response.status_code < 500, response.content
+
+    quantiles = statistics.quantiles(timings, n=100)
+    result = {
+        "queries": queries,
+        "p50_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(quantiles[94], 2),
+    }
+    benchmark_results[route.name] = result
+    if os.getenv("BENCHMARK_UPDATE_BUDGETS"):
+        return
+
+    budget = budgets[route.name]
+    assert (
+        result["queries"] <= budget["queries"]
+    ), f"{route.name}: {result['queries']} queries, budget {budget['queries']}"
+    assert (
+        result["p95_ms"] <= budget["p95_ms"]
+    ), f"{route.name}: p95 {result['p95_ms']} ms, budget {budget['p95_ms']} ms"
@@ -0,0 +1,23 @@
+import pytest
+from django.apps import apps
+from django.db import connections
+from django.db.models.signals import pre_migrate
+
+
+def create_trigram_extension(using, **kwargs):
+    """
+    Tables are created without migrations in tests (--nomigrations), the
+    trigram index on establishment names needs pg_trgm installed first
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+
+@pytest.fixture(scope="session")
+def django_db_modify_db_settings(django_db_modify_db_settings):
+    # runs before the test databases are created
+    pre_migrate.connect(
+        create_trigram_extension,
+        sender=apps.get_app_config("partner"),
+        dispatch_uid="create_trigram_extension",
+    )
@@ -0,0 +1,32 @@
+"""
+Gunicorn settings for serving happyhours.asgi with uvicorn workers, HTTP and
+the order WebSockets share the same process pool.
+
+    gunicorn -c gunicorn.conf.py happyhours.asgi:application
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+worker_class = 'uvicorn.workers.UvicornWorker'
+
+# Sync views run in a thread per request under ASGI, while the event loop of
+# a worker is bound to one core: the usual 2 x cores + 1 processes
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+
+# WebSockets stay open, recycle workers gradually and let sockets drain
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 200))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+
+accesslog = '-'
+
+
+def worker_exit(server, worker):
+    # send the mail and order notifications still queued in the worker
+    from happyhours.background import stop_background_queues
+
+    stop_background_queues()
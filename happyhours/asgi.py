@@ -1,19 +1,26 @@
+"""
+ASGI config for happyhours project.
+
+Serves HTTP and the order WebSockets from the same worker processes, see
+gunicorn.conf.py.
+"""
+
 import os
-import django
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'happyhours.settings.local')
-django.setup()
+
 from django.core.asgi import get_asgi_application
-from channels.auth import AuthMiddlewareStack
-from channels.routing import ProtocolTypeRouter, URLRouter
-from apps.order import routing
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'happyhours.settings.local')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'happyhours.settings.production')
+
+# set up Django before the consumers import models
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+
+from apps.order import routing  # noqa: E402
 
+# OrderConsumer authenticates with the JWT in the query string, so the
+# session-based AuthMiddlewareStack (a session query per connection) is not used
 application = ProtocolTypeRouter({
-    "http": get_asgi_application(),
-    "websocket": AuthMiddlewareStack(
-        URLRouter(
-             routing.websocket_urlpatterns
-        )
-    ),
+    'http': django_asgi_app,
+    'websocket': URLRouter(routing.websocket_urlpatterns),
 })
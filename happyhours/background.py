@@ -0,0 +1,156 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+import weakref
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# queues of the process, stopped and drained when it exits
+_queues = weakref.WeakSet()
+_STOP = object()
+
+
+class BackgroundQueue:
+    """
+    Work queued by requests and handled off the request path.
+
+    A background thread of the process collects what arrives within `window`
+    seconds (at most `batch_size` items, no limit if None) and passes it to
+    `handle`. `idle` is called once nothing arrived for `idle_timeout`
+    seconds. Whatever is still queued when the process exits is handled
+    before it does, see `stop_background_queues`.
+    """
+
+    thread_name = "background-queue"
+
+    def __init__(self, window, batch_size=None, idle_timeout=None, autostart=True):
+        self.window = window
+        self.batch_size = batch_size
+        self.idle_timeout = idle_timeout
+        self.autostart = autostart
+        self.queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._pid = None
+        _queues.add(self)
+
+    def handle(self, items):
+        raise NotImplementedError
+
+    def idle(self):
+        pass
+
+    def reset(self):
+        """
+        Drop state the worker of a parent process left behind after a fork
+        """
+
+    def enqueue(self, item):
+        self.queue.put(item)
+        if self.autostart:
+            self._ensure_worker()
+
+    def flush(self):
+        """
+        Handle everything queued so far from the calling thread
+        """
+        items = []
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                items.append(item)
+        size = self.batch_size or len(items)
+        for start in range(0, len(items), size):
+            self.handle(items[start : start + size])
+        self.idle()
+
+    def stop(self, timeout=None):
+        """
+        Let the worker finish its batch, then handle the rest of the queue
+        from the calling thread
+        """
+        worker = self._worker
+        if worker is not None and worker.is_alive() and self._pid == os.getpid():
+            self.queue.put(_STOP)
+            worker.join(timeout)
+            if worker.is_alive():
+                logger.warning(
+                    "%s did not stop within %ss, %d items left",
+                    self.thread_name,
+                    timeout,
+                    self.queue.qsize(),
+                )
+                return
+        self.flush()
+
+    def _ensure_worker(self):
+        # a forked worker process does not inherit the thread
+        if (
+            self._worker is not None
+            and self._worker.is_alive()
+            and self._pid == os.getpid()
+        ):
+            return
+        with self._lock:
+            if (
+                self._worker is None
+                or not self._worker.is_alive()
+                or self._pid != os.getpid()
+            ):
+                self._pid = os.getpid()
+                self.reset()
+                self._worker = threading.Thread(
+                    target=self._run, name=self.thread_name, daemon=True
+                )
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            try:
+                item = self.queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                self.idle()
+                continue
+            if item is _STOP:
+                return
+            items = [item]
+            stopping = False
+            deadline = time.monotonic() + self.window
+            while self.batch_size is None or len(items) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                items.append(item)
+            self.handle(items)
+            if stopping:
+                return
+
+
+def stop_background_queues():
+    """
+    Drain every queue of the process, registered to run at exit and called
+    by the `worker_exit` hook of gunicorn
+    """
+    for background_queue in list(_queues):
+        try:
+            background_queue.stop(timeout=settings.BACKGROUND_QUEUE_STOP_TIMEOUT)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Failed to drain %s", background_queue.thread_name)
+
+
+atexit.register(stop_background_queues)
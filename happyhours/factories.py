@@ -4,6 +4,7 @@ from django.contrib.gis.geos import Point
 from django.utils import timezone
 from apps.user.models import ROLE_CHOICES
 from apps.beverage.models import Category, Beverage
+from apps.feedback.models import Feedback, FeedbackAnswer
 from apps.order.models import Order
 from apps.partner.models import Establishment
 from faker import Faker
@@ -75,3 +76,21 @@ class OrderFactory(factory.django.DjangoModelFactory):
     beverage = factory.SubFactory(BeverageFactory)
     client = factory.SubFactory(UserFactory)
     order_date = factory.LazyFunction(timezone.now)
+
+
+class FeedbackFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Feedback
+
+    user = factory.SubFactory(UserFactory)
+    establishment = factory.SubFactory(EstablishmentFactory)
+    text = factory.Faker('paragraph')
+
+
+class FeedbackAnswerFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = FeedbackAnswer
+
+    feedback = factory.SubFactory(FeedbackFactory)
+    user = factory.SubFactory(UserFactory)
+    text = factory.Faker('paragraph')
@@ -0,0 +1,104 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+from .background import BackgroundQueue
+
+logger = logging.getLogger(__name__)
+
+
+class MailQueue(BackgroundQueue):
+    """
+    Outbound email sent off the request path.
+
+    Requests only queue messages. The background thread collects what
+    arrives within `window` seconds (at most `batch_size` messages) and sends
+    it over one SMTP connection, which is kept open between batches until it
+    has been idle for `idle_timeout` seconds. A message that fails is retried
+    on a fresh connection with exponential backoff, `max_retries` times.
+    """
+
+    thread_name = "mail-queue"
+
+    def __init__(
+        self,
+        window=None,
+        batch_size=None,
+        max_retries=None,
+        backoff=None,
+        idle_timeout=None,
+        autostart=True,
+    ):
+        super().__init__(
+            window=window if window is not None else settings.MAIL_QUEUE_WINDOW,
+            batch_size=batch_size or settings.MAIL_QUEUE_BATCH_SIZE,
+            idle_timeout=(
+                idle_timeout
+                if idle_timeout is not None
+                else settings.MAIL_CONNECTION_IDLE_TIMEOUT
+            ),
+            autostart=autostart,
+        )
+        self.max_retries = (
+            max_retries if max_retries is not None else settings.MAIL_QUEUE_MAX_RETRIES
+        )
+        self.backoff = backoff if backoff is not None else settings.MAIL_QUEUE_BACKOFF
+        self._connection = None
+
+    def handle(self, items):
+        self.send(items)
+
+    def idle(self):
+        self.close()
+
+    def reset(self):
+        self._connection = None
+
+    def send(self, messages):
+        pending = list(messages)
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            pending = self._send_messages(pending)
+            if not pending:
+                return
+        for message in pending:
+            logger.error("Giving up sending email %r to %s", message.subject, message.to)
+
+    def close(self):
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Failed to close the mail connection")
+            self._connection = None
+
+    def _send_messages(self, messages):
+        """
+        :return: messages which could not be sent
+        """
+        failed = []
+        for message in messages:
+            try:
+                if self._connection is None:
+                    self._connection = get_connection(fail_silently=False)
+                    self._connection.open()
+                self._connection.send_messages([message])
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Failed to send email to %s", message.to, exc_info=True)
+                # the connection may be broken, reconnect for the next message
+                self.close()
+                failed.append(message)
+        return failed
+
+
+mail_queue = MailQueue()
+
+
+def queue_mail(subject, body, recipient_list, from_email=None):
+    """
+    `send_mail` that returns at once, the message is sent by the mail queue
+    """
+    mail_queue.enqueue(EmailMessage(subject, body, from_email, recipient_list))
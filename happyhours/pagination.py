@@ -0,0 +1,107 @@
+import json
+from collections import OrderedDict
+
+from django.db import connections
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.response import Response
+
+
+def approximate_count(queryset, exact_below=1000):
+    """
+    Row count estimated by the Postgres planner instead of COUNT(*). Small
+    estimates are unreliable and cheap to count, they are counted exactly
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count()
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    estimate = int(plan[0]["Plan"]["Plan Rows"])
+    if estimate < exact_below:
+        return queryset.count()
+    return estimate
+
+
+class LegacyLimitOffsetPagination(LimitOffsetPagination):
+    default_limit = 10
+    max_limit = 100
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination over a unique, indexed ordering. Pages are fetched with
+    `WHERE key < cursor` instead of OFFSET and without COUNT(*).
+
+    A view sets its key with `keyset_ordering` (default `-id`).
+    `?count=approximate` or `?count=exact` adds a `count` to the page.
+    Clients still sending `offset` get LimitOffset pages, `limit` alone is
+    the page size of the first page.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-id"
+    count_query_param = "count"
+    legacy_pagination_class = LegacyLimitOffsetPagination
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, "keyset_ordering", None)
+        if ordering:
+            return (ordering,) if isinstance(ordering, str) else tuple(ordering)
+        return super().get_ordering(request, queryset, view)
+
+    def get_page_size(self, request):
+        if "limit" in request.query_params and self.page_size_query_param not in (
+            request.query_params
+        ):
+            legacy = self.legacy_pagination_class()
+            return legacy.get_limit(request)
+        return super().get_page_size(request)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.legacy = None
+        self.count = None
+        if "offset" in request.query_params and (
+            self.cursor_query_param not in request.query_params
+        ):
+            self.legacy = self.legacy_pagination_class()
+            ordering = self.get_ordering(request, queryset, view)
+            return self.legacy.paginate_queryset(
+                queryset.order_by(*ordering), request, view
+            )
+
+        count_mode = request.query_params.get(self.count_query_param)
+        if count_mode == "exact":
+            self.count = queryset.count()
+        elif count_mode == "approximate" or "limit" in request.query_params:
+            self.count = approximate_count(queryset)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.legacy is not None:
+            return self.legacy.get_paginated_response(data)
+        page = [
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data),
+        ]
+        if self.count is not None:
+            page.insert(0, ("count", self.count))
+        return Response(OrderedDict(page))
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"] = {
+            "count": {
+                "type": "integer",
+                "example": 123,
+                "description": "Only with ?count=approximate|exact",
+            },
+            **response_schema["properties"],
+        }
+        return response_schema
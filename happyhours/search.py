@@ -0,0 +1,55 @@
+import re
+
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramWordSimilarity,
+)
+from django.db.models import F, Q
+from rest_framework.filters import SearchFilter
+
+
+def prefix_search_query(text):
+    """
+    Full-text query matching every word of `text` as a prefix, so partly
+    typed words still match. Only word characters reach the tsquery
+    :return: SearchQuery or None if `text` has no words
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    return SearchQuery(
+        " & ".join(f"{word}:*" for word in words),
+        search_type="raw",
+        config=settings.SEARCH_CONFIG,
+    )
+
+
+class RankedSearchFilter(SearchFilter):
+    """
+    `?search=` over the model's maintained `search_vector` (GIN indexed),
+    ranked by relevance. Rows whose `search_trigram_fields` contain a word
+    similar to the search match too, so typos still find them.
+
+    Nothing is joined, every row is returned once. Results are ordered by
+    rank unless an earlier filter already ordered them.
+    """
+
+    search_vector_field = "search_vector"
+
+    def filter_queryset(self, request, queryset, view):
+        text = " ".join(self.get_search_terms(request))
+        query = prefix_search_query(text)
+        if query is None:
+            return queryset
+
+        condition = Q(**{self.search_vector_field: query})
+        rank = SearchRank(F(self.search_vector_field), query)
+        for field in getattr(view, "search_trigram_fields", ()):
+            condition |= Q(**{f"{field}__trigram_word_similar": text})
+            rank = rank + TrigramWordSimilarity(text, field)
+        queryset = queryset.filter(condition).annotate(search_rank=rank)
+        if not queryset.query.order_by:
+            queryset = queryset.order_by("-search_rank", "pk")
+        return queryset
@@ -39,6 +39,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     'django.contrib.gis',
+    'django.contrib.postgres',
     # dependencies
     "corsheaders",
     'django_filters',
@@ -51,6 +52,7 @@ INSTALLED_APPS = [
     "apps.partner.apps.PartnerConfig",
     "apps.order.apps.OrderConfig",
     "apps.feedback.apps.FeedbackConfig",
+    "apps.analytics.apps.AnalyticsConfig",
 ]
 
 MIDDLEWARE = [
@@ -87,6 +89,16 @@ WSGI_APPLICATION = "happyhours.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Seconds a connection is reused across requests, 0 closes it after each one.
+# Under ASGI every request runs its sync code in a thread of its own, so keep 0
+# there and pool connections through pgbouncer instead
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', 0))
+DB_CONN_HEALTH_CHECKS = os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True'
+# Required behind pgbouncer in transaction pooling mode
+DB_DISABLE_SERVER_SIDE_CURSORS = (
+    os.getenv('DB_DISABLE_SERVER_SIDE_CURSORS', 'False') == 'True'
+)
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -95,9 +107,47 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT'),
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
+        'DISABLE_SERVER_SIDE_CURSORS': DB_DISABLE_SERVER_SIDE_CURSORS,
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Password reset codes: seconds a code stays valid, checks allowed and codes
+# issued per email within that time
+RESET_CODE_TIMEOUT = int(os.getenv('RESET_CODE_TIMEOUT', 10 * 60))
+RESET_CODE_MAX_ATTEMPTS = int(os.getenv('RESET_CODE_MAX_ATTEMPTS', 5))
+RESET_CODE_MAX_ISSUES = int(os.getenv('RESET_CODE_MAX_ISSUES', 3))
+
+# Seconds a serialized establishment menu is kept in the cache
+MENU_CACHE_TIMEOUT = int(os.getenv('MENU_CACHE_TIMEOUT', 60 * 60))
+
+# Autocomplete: in-process cache of hot prefixes, longest prefix looked up
+# and the period of orders ranking the suggestions
+AUTOCOMPLETE_CACHE_SIZE = int(os.getenv('AUTOCOMPLETE_CACHE_SIZE', 5000))
+AUTOCOMPLETE_CACHE_TTL = int(os.getenv('AUTOCOMPLETE_CACHE_TTL', 5 * 60))
+AUTOCOMPLETE_MAX_LENGTH = int(os.getenv('AUTOCOMPLETE_MAX_LENGTH', 50))
+AUTOCOMPLETE_POPULARITY_DAYS = int(os.getenv('AUTOCOMPLETE_POPULARITY_DAYS', 30))
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -116,6 +166,20 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# https://docs.djangoproject.com/en/4.2/topics/auth/passwords/
+
+PASSWORD_HASHERS = [
+    'apps.user.hashers.ConfigurablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# PBKDF2 work factor, login cost grows linearly with it (Django default 600000)
+PASSWORD_HASHER_ITERATIONS = int(os.getenv('PASSWORD_HASHER_ITERATIONS', 600000))
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -135,7 +199,7 @@ REST_FRAMEWORK = {
     'DEFAULT_LIMIT': 10,
     'MAX_LIMIT': 100,
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.user.authentication.ClaimsJWTAuthentication',
     ),
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend',
                                 'rest_framework.filters.SearchFilter',
@@ -144,6 +208,32 @@ REST_FRAMEWORK = {
     'TEST_REQUEST_DEFAULT_FORMAT': 'json',
 }
 
+# Text search configuration of the search vectors, `simple` does not stem so
+# names in any language match as typed
+SEARCH_CONFIG = os.getenv('SEARCH_CONFIG', 'simple')
+
+# Upper bound on establishments returned by a `near_me` radius search
+NEAR_ME_MAX_RESULTS = int(os.getenv('NEAR_ME_MAX_RESULTS', 200))
+
+# Cache of `near_me` searches: geohash precision of the cells sharing an
+# entry, radius buckets (meters, larger searches are not cached), precision
+# of the cells invalidated when an establishment changes, seconds an entry
+# is kept, most ids per entry and seconds between hit/miss stats flushes
+GEO_CACHE_PRECISION = int(os.getenv('GEO_CACHE_PRECISION', 6))
+GEO_CACHE_RADIUS_BUCKETS = [
+    int(bucket) for bucket in
+    os.getenv('GEO_CACHE_RADIUS_BUCKETS', '500,1000,2000,5000,10000').split(',')
+]
+GEO_CACHE_VERSION_PRECISION = int(os.getenv('GEO_CACHE_VERSION_PRECISION', 4))
+GEO_CACHE_TTL = int(os.getenv('GEO_CACHE_TTL', 5 * 60))
+GEO_CACHE_MAX_IDS = int(os.getenv('GEO_CACHE_MAX_IDS', 2000))
+GEO_CACHE_STATS_FLUSH_INTERVAL = float(os.getenv('GEO_CACHE_STATS_FLUSH_INTERVAL', 10))
+
+# Map viewport clustering: grid cells per map tile side, and most cells per
+# bounding box side whatever the zoom
+MAP_CELLS_PER_TILE = int(os.getenv('MAP_CELLS_PER_TILE', 4))
+MAP_MAX_GRID = int(os.getenv('MAP_MAX_GRID', 64))
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Happy Hours',
     'DESCRIPTION': 'Happy Hours API',
@@ -160,6 +250,9 @@ SIMPLE_JWT = {
     'BLACKLIST_AFTER_ROTATION': True,
     'UPDATE_LAST_LOGIN': False,
 
+    'TOKEN_REFRESH_SERIALIZER': 'apps.user.serializers.TokenRefreshSerializer',
+    'TOKEN_BLACKLIST_SERIALIZER': 'apps.user.serializers.TokenBlacklistSerializer',
+
     'ALGORITHM': 'HS256',
 
     'VERIFYING_KEY': None,
@@ -192,6 +285,19 @@ EMAIL_PORT = 587
 EMAIL_HOST_USER = os.getenv('GMAIL_USER')
 EMAIL_HOST_PASSWORD = os.getenv('GMAIL_PASSWORD')
 
+# Outbound mail queue: seconds to collect a batch, messages per batch, retries
+# of a failed message with exponential backoff from MAIL_QUEUE_BACKOFF seconds,
+# seconds an idle SMTP connection is kept open
+MAIL_QUEUE_WINDOW = float(os.getenv('MAIL_QUEUE_WINDOW', 0.5))
+MAIL_QUEUE_BATCH_SIZE = int(os.getenv('MAIL_QUEUE_BATCH_SIZE', 20))
+MAIL_QUEUE_MAX_RETRIES = int(os.getenv('MAIL_QUEUE_MAX_RETRIES', 3))
+MAIL_QUEUE_BACKOFF = float(os.getenv('MAIL_QUEUE_BACKOFF', 1))
+MAIL_CONNECTION_IDLE_TIMEOUT = float(os.getenv('MAIL_CONNECTION_IDLE_TIMEOUT', 30))
+
+# Seconds a background queue (mail, order notifications) may take to finish
+# its batch when the process exits, the rest is then handled at once
+BACKGROUND_QUEUE_STOP_TIMEOUT = float(os.getenv('BACKGROUND_QUEUE_STOP_TIMEOUT', 10))
+
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/4.2/howto/static-files/
 
@@ -212,3 +318,21 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Order events arriving within this many seconds are sent as one WebSocket frame
+ORDER_NOTIFICATION_WINDOW = float(os.getenv('ORDER_NOTIFICATION_WINDOW', 0.05))
+ORDER_NOTIFICATION_MAX_BATCH = int(os.getenv('ORDER_NOTIFICATION_MAX_BATCH', 50))
+
+# In-process cache of validated WebSocket tokens and establishment owners
+WS_AUTH_CACHE_TTL = int(os.getenv('WS_AUTH_CACHE_TTL', 60))
+WS_AUTH_CACHE_SIZE = int(os.getenv('WS_AUTH_CACHE_SIZE', 10000))
+
+# Cache refresh token blacklist lookups, only safe when the cache is shared by
+# every process. Tokens found valid are re-checked in the database after the TTL
+TOKEN_BLACKLIST_CACHE = os.getenv('TOKEN_BLACKLIST_CACHE', str(bool(REDIS_URL))) == 'True'
+TOKEN_BLACKLIST_CACHE_TTL = int(os.getenv('TOKEN_BLACKLIST_CACHE_TTL', 60))
+
+# Seconds the token revocation time of a user is cached before the row is read again
+TOKEN_REVOCATION_CACHE_TTL = int(os.getenv('TOKEN_REVOCATION_CACHE_TTL', 300))
+
+# Longest period, in days, an order dashboard may cover
+ANALYTICS_MAX_DAYS = int(os.getenv('ANALYTICS_MAX_DAYS', 92))
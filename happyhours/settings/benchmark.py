@@ -0,0 +1,37 @@
+"""
+Settings for the query-count and latency benchmarks in `benchmarks/`.
+
+Runs against a local PostGIS, the search vectors and trigram indexes need
+PostgreSQL. BENCHMARK_DB_ENGINE and BENCHMARK_DB_NAME select another one.
+"""
+import os
+
+os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+os.environ.setdefault('ALLOWED_HOSTS', '*')
+
+from .base import *  # noqa: E402,F401,F403
+
+DEBUG = False
+
+DATABASES = {
+    'default': {
+        'ENGINE': os.getenv(
+            'BENCHMARK_DB_ENGINE', 'django.contrib.gis.db.backends.postgis'
+        ),
+        'NAME': os.getenv('BENCHMARK_DB_NAME', 'happyhours_benchmark'),
+        'USER': os.getenv('DB_USER'),
+        'PASSWORD': os.getenv('DB_PASSWORD'),
+        'HOST': os.getenv('DB_HOST', 'localhost'),
+        'PORT': os.getenv('DB_PORT', '5432'),
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
+    }
+}
+
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels.layers.InMemoryChannelLayer',
+    },
+}
@@ -30,6 +30,7 @@ v1_api = (
         path('partner/', include('apps.partner.urls')),
         path('user/', include('apps.user.urls')),
         path('feedback/', include('apps.feedback.urls')),
+        path('analytics/', include('apps.analytics.urls')),
     ], 'v1',
 )
 